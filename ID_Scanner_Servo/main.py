@@ -2,6 +2,9 @@ import network, ntptime, time, socket, _thread  # networking, NTP, timing, socke
 from machine import Pin                   # GPIO control
 from mfrc522 import MFRC522               # RFID reader driver
 from servo import Servo                   # Servo motor controller
+from uplink import Uplink                 # batched event push to the collector
+from peerlink import PeerLink             # motion gating, unlock announcements
+from power import Power                   # idle light sleep
 
 # ─── USER CONFIG ────────────────────────────────────────────────────────────────
 SSID     = 'Berkeley-IoT'                 # Wi-Fi network name
@@ -38,6 +41,19 @@ switch = Pin(36, Pin.IN, Pin.PULL_DOWN)    # door-closed switch w/ pull-down
 LOGFILE = 'log.csv'                       # log filename
 PORT    = 80                              # HTTP server port
 
+COLLECTOR_HOST = None                     # collector IP, None disables event push
+COLLECTOR_PORT = 9999                     # collector UDP ingest port
+PEER_PORT      = None                     # node-to-node UDP port, None disables motion gating
+PRESENCE_MS    = 60_000                   # keep the reader on this long after motion
+IR_STALE_MS    = 90_000                   # IR host silent this long -> poll regardless
+GATE_POLL_MS   = 20                       # loop period while the reader is gated off
+POWER_SAVE     = False                    # light-sleep between polls when idle (web UI only in wake windows)
+IDLE_AFTER_MS  = 60_000                   # no taps this long -> start sleeping
+SLEEP_POLL_MS  = 100                      # one reader poll per light-sleep slice while idle
+FIELD_ON_MS    = 5                        # tag power-up after the antenna comes on (ISO 14443-3)
+WAKE_EVERY_S   = 900                      # periodic wake window for uploads, NTP, web UI
+WAKE_WINDOW_MS = 15_000                   # how long each wake window stays up
+
 # ─── WIFI & TIME ─────────────────────────────────────────────────────────────
 def connect_wifi():
     wlan = network.WLAN(network.STA_IF)   # create station interface
@@ -77,13 +93,18 @@ except OSError:
         f.write("timestamp,uid,username\n")  # create header if missing
 
 def log_access(uid, username):
+    ts = timestamp()
     with open(LOGFILE, 'a') as f:
-        f.write("{},{},{}\n".format(timestamp(), uid, username))  # append entry
-    print("Logged:", uid, username, "at", timestamp())
+        f.write("{},{},{}\n".format(ts, uid, username))  # append entry
+    uplink.push(ts, 'tap', uid, username)  # queue for collector (never blocks)
+    print("Logged:", uid, username, "at", ts)
 
 # ─── RFID SETUP ─────────────────────────────────────────────────────────────────
 rfid = MFRC522(SCK, MOSI, MISO, RST, CS)  # init RFID reader
 seen = set()                              # track seen UIDs
+uplink = Uplink(COLLECTOR_HOST, COLLECTOR_PORT, 'id')  # event push to collector
+peers = PeerLink(PEER_PORT, 'id')         # motion in, unlocks out
+power = Power(POWER_SAVE, None, IDLE_AFTER_MS, WAKE_EVERY_S, WAKE_WINDOW_MS, sync_time)  # timer wake only
 
 # ─── WEB SERVER ────────────────────────────────────────────────────────────────
 def web_server():
@@ -167,19 +188,43 @@ def web_server():
 """)  # send the live-view page
         cl.close()                      # close connection
 
+# ─── MOTION GATING ─────────────────────────────────────────────────────────────
+def someone_present():
+    # poll while IR_Buzzer_Host reports motion, or whenever it has gone quiet (fail open)
+    return peers.recent('motion', PRESENCE_MS) or not peers.alive('ir', IR_STALE_MS)
+
 # ─── MAIN ───────────────────────────────────────────────────────────────────────
 def main():
     ip = connect_wifi()               # join Wi-Fi
     sync_time()                       # sync clock
     _thread.start_new_thread(web_server, ())  # start server thread
+    uplink.start()                    # background collector push
+    peers.start()                     # peer receiver thread
 
     print(f"RFID scanner ready. Visit http://{ip}/ to view live log.")
+    antenna = True                    # init() leaves the antenna on
     while True:
+        asleep = power.can_sleep() and not peers.recent('motion', PRESENCE_MS)  # idle: one poll per light-sleep slice
+        if not someone_present():             # empty shop: antenna off, no polling
+            if antenna:
+                rfid.antenna_on(False); antenna = False
+            if asleep:
+                power.sleep(SLEEP_POLL_MS)     # idle too: sleep the slice, field stays off
+            else:
+                time.sleep_ms(GATE_POLL_MS)
+            continue
+        if not antenna:
+            rfid.antenna_on(True); antenna = True  # motion or next sleep slice: field back on
+            time.sleep_ms(FIELD_ON_MS)        # a REQA sooner goes unanswered
         status, _ = rfid.request(rfid.REQIDL)  # poll for tag
         if status == rfid.OK:
             status, raw = rfid.anticoll()      # read UID
             if status == rfid.OK:
                 uid = "".join(f"{b:02X}" for b in raw)  # format hex
+                woke = power.ready()    # upper bound: ms from sleep start to this read
+                power.activity()        # stay awake for the next few taps
+                if woke is not None:
+                    print("sleep->ready", woke, "ms")
 
                 if uid not in seen:
                     print("✔ New tag:", uid)
@@ -191,6 +236,7 @@ def main():
                     user = AUTHORIZED_USERS[uid]  # lookup user
                     print(f"User Verified: {user} ({uid})")
                     led_green.value(1)    # indicate success
+                    peers.publish('auth', uid)  # silences an armed IR alarm
                     log_access(uid, user)  # record access
                     motor.move(90)       # unlock
                     time.sleep(1)
@@ -199,6 +245,7 @@ def main():
                         time.sleep_ms(50)
                     print("closing")
                     motor.move(0)        # relock
+                    uplink.push(timestamp(), 'close', uid, user)  # ends the session on the collector
                 else:
                     user = "Unauthorized"
                     print(f"Unauthorized User Access Attempt: {uid}")
@@ -207,7 +254,11 @@ def main():
                     led_red.value(0)
                     log_access(uid, user)  # log attempt
 
-        time.sleep_ms(200)               # debounce delay
+        if asleep:
+            rfid.antenna_on(False); antenna = False  # field off while the CPU sleeps
+            power.sleep(SLEEP_POLL_MS)  # timer wake for the next poll
+        else:
+            time.sleep_ms(200)           # debounce delay
 
 if __name__ == "__main__":
     main()                              # start program
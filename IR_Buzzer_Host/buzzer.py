@@ -5,6 +5,7 @@ class Buzzer:
     def __init__(self, pin):
         # store the pin number for later use
         self.pin = pin
+        self.cancel_flag = False          # set by /stop or a card unlock to cut a sweep short
         print(f"Buzzer initialized on pin {self.pin}")
 
     def alert(self, freq=300, duty=700, duration=0.25):
@@ -20,15 +21,14 @@ class Buzzer:
         buzzer_pwm.deinit()               # stop PWM and silence buzzer
         
     def alarm(self):
+        # cancel_flag is cleared by the caller when it arms the alarm, not here:
+        # a cancel from another thread between sweeps must not be lost
         buzzer_pwm = PWM(Pin(self.pin))   # start PWM for sweep alarm
-        # sweep frequency up from 300Hz to 1200Hz
-        for freq in range(300, 1201, 4):
+        # sweep frequency up from 300Hz to 1200Hz, then back down to 300Hz
+        for freq in list(range(300, 1201, 4)) + list(range(1200, 299, -4)):
+            if self.cancel_flag:          # silenced mid-sweep
+                break
             buzzer_pwm.freq(freq)         # update PWM frequency
             time.sleep(0.01)              # short delay for audible glide
                 
-        # gradually sweep down from 1200Hz back to 300Hz
-        for freq in range(1200, 299, -4):
-            buzzer_pwm.freq(freq)         # update PWM frequency
-            time.sleep(0.01)              # maintain smooth transition
-                
         buzzer_pwm.deinit()               # stop PWM and silence buzzer
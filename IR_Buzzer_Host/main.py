@@ -2,6 +2,10 @@ import network, ntptime, time, socket, _thread    # Wi-Fi, NTP, timing, sockets,
 from machine import Pin                          # GPIO pin control
 from buzzer import Buzzer                        # buzzer driver
 import ujson as json                             # lightweight JSON module
+from uplink import Uplink                        # batched event push to the collector
+from peerlink import PeerLink                    # motion / unlock broadcast to the scanners
+from schedule import Schedule                    # business-hours calendar with timer wakeups
+from power import Power                          # idle light sleep, PIR wake
 
 # ─── USER CONFIG ────────────────────────────────────────────────────────────────
 WIFI_SSID             = 'Berkeley-IoT'         # Wi-Fi SSID
@@ -11,22 +15,38 @@ SUBNET_MASK           = '255.255.252.0'        # network mask
 GATEWAY               = '10.41.196.1'          # gateway router
 DNS_SERVER            = '128.32.206.9'         # DNS server
 TIMEZONE_OFFSET_HOURS = -7                     # offset from UTC hours
-BUSINESS_START_HOUR   = 9                      # business hours start
-BUSINESS_END_HOUR     = 17                     # business hours end
+BUSINESS_HOURS        = [                      # weekly rules: (weekdays Mon=0, open, close)
+    ((0, 1, 2, 3, 4, 5, 6), '09:00', '17:00'),
+]
+HOLIDAYS              = []                     # 'YYYY-MM-DD' days that stay after-hours
 ALERT_INTERVAL_MS     = 10_000                 # ms between buzz alerts
+COLLECTOR_HOST        = None                   # collector IP, None disables event push
+COLLECTOR_PORT        = 9999                   # collector UDP ingest port
+PEER_PORT             = None                   # node-to-node UDP port, None disables motion messages
+MOTION_REPEAT_MS      = 5_000                  # re-announce motion while the PIR stays high
+HEARTBEAT_MS          = 30_000                 # armed-state broadcast so scanners know we're alive
+AUTH_QUIET_MS         = 600_000                # no new alarm this long after a card unlock
+POWER_SAVE            = False                  # light-sleep after hours until the PIR fires
+IDLE_AFTER_MS         = 60_000                 # no motion this long -> start sleeping
+WAKE_EVERY_S          = 900                    # periodic wake window for uploads, NTP, web UI
+WAKE_WINDOW_MS        = 15_000                 # how long each wake window stays up
 
 # ─── STATE ─────────────────────────────────────────────────────────────────────
-override_force   = False                       # force after-hours mode
-override_disable = False                       # disable after-hours mode
 alarm_active     = False                       # ongoing alarm sweep flag
 last_buzz        = 0                           # timestamp of last alert
 prev_motion      = False                       # previous PIR state
 events           = []                          # recent events list
+last_motion_pub  = 0                           # when motion was last announced
+last_heartbeat   = 0                           # when armed state was last announced
+prev_armed       = None                        # armed state last announced
+last_auth        = None                        # ticks of the latest card unlock
 
 # ─── HARDWARE ──────────────────────────────────────────────────────────────────
 pir    = Pin(36, Pin.IN)                       # PIR motion sensor input
 buzz   = Buzzer(12)                            # buzzer on pin 12
 led    = Pin(25, Pin.OUT)                      # status LED output
+uplink = Uplink(COLLECTOR_HOST, COLLECTOR_PORT, 'ir')  # event push to collector
+peers  = PeerLink(PEER_PORT, 'ir')             # motion out, card unlocks in
 
 # ─── NETWORK SETUP ─────────────────────────────────────────────────────────────
 sta = network.WLAN(network.STA_IF)             # station interface
@@ -62,15 +82,71 @@ def timestamp():
     y,m,d,H,M,S = time.localtime(t)[0:6]
     return f"{y:04d}-{m:02d}-{d:02d} {H:02d}:{M:02d}:{S:02d}"  # ISO style
 
+def fmt_local(t):
+    return fmt(time.localtime(t))                # local epoch seconds -> dashboard format
+
 # ─── BUSINESS LOGIC ────────────────────────────────────────────────────────────
-def is_business_hour(h):
-    return BUSINESS_START_HOUR <= h < BUSINESS_END_HOUR  # within hours
+def mode_changed(business, until):
+    print("Mode ->", 'Business' if business else 'After-hours', "until", fmt_local(until))
+
+# built after NTP so the first wakeup is armed against the right clock
+sched = Schedule(BUSINESS_HOURS, HOLIDAYS, TIMEZONE_OFFSET_HOURS*3600, mode_changed)
+
+# ─── POWER ─────────────────────────────────────────────────────────────────────
+def resync():
+    try:
+        ntptime.settime()                      # wake window: correct RTC drift
+    except:
+        pass
+    sched.update()                             # clock may have moved under the schedule
+
+power = Power(POWER_SAVE, pir, IDLE_AFTER_MS, WAKE_EVERY_S, WAKE_WINDOW_MS, resync)  # PIR wakes via ext0
+
+def query_arg(req, name):
+    path = req.split(' ')[1] if ' ' in req else ''    # 'GET /disable?until=18:00 HTTP/1.0'
+    for kv in path.partition('?')[2].split('&'):
+        k, _, v = kv.partition('=')
+        if k == name: return v
+    return None
+
+def override_until(req):
+    until, mins = query_arg(req, 'until'), query_arg(req, 'mins')
+    if until: return sched.at(until)                 # next HH:MM, ValueError if malformed
+    if mins:
+        mins = int(mins)                             # ValueError if not a number
+        if not 0 < mins <= 7*24*60:
+            raise ValueError('mins out of range')
+        return sched.now() + mins*60                 # for N minutes, at most a week
+    return None                                      # until the next scheduled change
+
+def hold(cl, business, req):
+    try:
+        until = override_until(req)
+    except ValueError:
+        cl.send("HTTP/1.0 400 Bad Request\r\n\r\n")  # e.g. ?until=18 or ?mins=x
+        return
+    sched.hold(business, until)
+    cl.send("HTTP/1.0 200 OK\r\n\r\n")
 
-def effective_business(h):
-    biz = is_business_hour(h)
-    if override_force and biz:      return False         # force off
-    if override_disable and not biz: return True         # disable off-hours
-    return biz                                          # default
+# ─── PEER MESSAGES ─────────────────────────────────────────────────────────────
+def add_event(ts, kind):
+    events.insert(0,[ts,kind])                 # prepend event
+    if len(events)>10: events.pop()
+
+def on_auth(uid, node):
+    global alarm_active, last_auth
+    if node != 'id':
+        return                                 # only the door reader unlocks the shop
+    last_auth = time.ticks_ms()                # authorized person is in the shop
+    if alarm_active:
+        alarm_active = False                   # stop after the current sweep step
+        buzz.cancel_flag = True
+        ts = timestamp()
+        print("Alarm silenced by card", uid)
+        add_event(ts,'silenced')
+        uplink.push(ts, 'silenced', uid)       # queue for collector
+
+peers.on('auth', on_auth)                      # ID_Scanner_Servo unlocks
 
 # ─── WEB SERVER THREAD ──────────────────────────────────────────────────────────
 INDEX_HTML = """\
@@ -90,10 +166,13 @@ INDEX_HTML = """\
     <p>Clock: <span id="clock">…</span></p>
     <p>Business hours now? <span id="biz">…</span></p>
     <p>Mode: <span id="mode">…</span></p>
+    <p>Next change: <span id="next">…</span> <span id="override"></span></p>
   </div>
   <div id="controls">
-    <button onclick="action('force')">Force After-hours</button>
-    <button onclick="action('disable')">Disable After-hours</button>
+    Until <input id="until" type="time">
+    <button onclick="hold('force')">Force After-hours</button>
+    <button onclick="hold('disable')">Disable After-hours</button>
+    <button onclick="action('resume')">Resume Schedule</button>
     <button onclick="action('stop')">Stop Alarm</button>
     <button onclick="action('clear')">Clear Log</button>
   </div>
@@ -107,6 +186,8 @@ INDEX_HTML = """\
       document.getElementById('clock').innerText = d.clock;
       document.getElementById('biz').innerText   = d.business;
       document.getElementById('mode').innerText  = d.mode;
+      document.getElementById('next').innerText  = d.next_change;
+      document.getElementById('override').innerText = d.override ? '(override)' : '';
       let rows = d.events.map(e=>`<tr><td>${e[0]}</td><td>${e[1]}</td></tr>`).join('');
       document.getElementById('events').innerHTML =
         '<tr><th>Timestamp</th><th>Type</th></tr>'+rows;
@@ -115,6 +196,10 @@ INDEX_HTML = """\
   function action(cmd){
     fetch(cmd).then(_=>loadStatus());
   }
+  function hold(cmd){
+    const until = document.getElementById('until').value;
+    action(until ? cmd + '?until=' + until : cmd);
+  }
   window.onload = loadStatus;
   setInterval(loadStatus,5000);
   </script>
@@ -129,7 +214,7 @@ def web_server():
     s.settimeout(0.5)                           # accept timeout
     print("Web server running…")               # startup message
 
-    global override_force, override_disable, alarm_active, events
+    global alarm_active, events
 
     while True:
         try:
@@ -137,13 +222,13 @@ def web_server():
             req = cl.recv(1024).decode()       # read request
 
             if 'GET /status' in req:
-                lt  = get_localtime()          # current local time
-                biz = is_business_hour(lt[3])
-                eff = effective_business(lt[3])
                 resp = {                       # prepare JSON response
-                  'clock': fmt(lt),
-                  'business': 'Yes' if biz else 'No',
-                  'mode': 'Business Mode' if eff else 'After-hours Mode',
+                  'clock': fmt(get_localtime()),
+                  'business': 'Yes' if sched.scheduled else 'No',
+                  'mode': 'Business Mode' if sched.business else 'After-hours Mode',
+                  'next_change': fmt_local(sched.next_change),
+                  'override': sched.override is not None,
+                  'power': power.stats(),
                   'events': events
                 }
                 j = json.dumps(resp)            # serialize JSON
@@ -151,11 +236,13 @@ def web_server():
                 cl.send(j)                      # send JSON payload
 
             elif 'GET /force' in req:
-                override_force, override_disable = True, False  # set flags
-                cl.send("HTTP/1.0 200 OK\r\n\r\n")
+                hold(cl, False, req)            # armed until ?until=HH:MM / ?mins=N
 
             elif 'GET /disable' in req:
-                override_disable, override_force = True, False  # set flags
+                hold(cl, True, req)             # disarmed until ?until=HH:MM / ?mins=N
+
+            elif 'GET /resume' in req:
+                sched.resume()                  # back to the weekly rules
                 cl.send("HTTP/1.0 200 OK\r\n\r\n")
 
             elif 'GET /stop' in req:
@@ -174,9 +261,13 @@ def web_server():
             cl.close()                          # close client socket
         except OSError:
             pass                                 # ignore accept timeouts
+        except ValueError:
+            cl.close()                           # undecodable request: drop it, keep serving
 
 # launch server thread
 _thread.start_new_thread(web_server, ())        # run server concurrently
+uplink.start()                                  # background collector push
+peers.start()                                   # peer receiver thread
 
 print(f"Ready @ http://{IP}/")                # print dashboard URL
 
@@ -184,25 +275,46 @@ print(f"Ready @ http://{IP}/")                # print dashboard URL
 while True:
     now    = time.ticks_ms()                   # current time ms
     motion = bool(pir.value())                 # read PIR sensor
-    lt     = get_localtime()                   # local time tuple
-    eff    = effective_business(lt[3])         # determine operating mode
+    if sched.due or sched.now() >= sched.recheck:
+        sched.update()                         # timer fired, or it stalled in light sleep
+    eff    = sched.business                    # operating mode
+    if last_auth is not None and not 0 <= time.ticks_diff(now,last_auth) < AUTH_QUIET_MS:
+        last_auth = None                       # expired: forget it before ticks_ms wraps
+
+    if motion and (not prev_motion or time.ticks_diff(now,last_motion_pub) >= MOTION_REPEAT_MS):
+        peers.publish('motion')                # wake the scanners' readers first
+        last_motion_pub = now
+    if (not eff) != prev_armed or time.ticks_diff(now,last_heartbeat) >= HEARTBEAT_MS:
+        prev_armed = not eff                   # after-hours mode = armed
+        peers.publish('armed', 1 if prev_armed else 0)
+        last_heartbeat = now
 
     if motion and not prev_motion:             # on motion start
         ts = timestamp()                       # ISO timestamp
+        woke = power.ready()                   # ms from the ext0 (PIR) wake to here
+        power.activity()                       # stay awake while people are around
         print("Motion at", ts)
+        if woke is not None:
+            print("sleep->ready", woke, "ms")
         if eff:
             if time.ticks_diff(now,last_buzz) >= ALERT_INTERVAL_MS:
                 buzz.alert()                   # short alert tone
                 last_buzz = now                # update last alert time
-                events.insert(0,[ts,'alert'])  # prepend event
-                if len(events)>10: events.pop()
+                add_event(ts,'alert')
+                uplink.push(ts, 'alert')       # queue for collector
+        elif last_auth is not None:            # card unlock within AUTH_QUIET_MS
+            print("Alarm held off, card unlock", time.ticks_diff(now,last_auth)//1000, "s ago")
         else:
+            buzz.cancel_flag = False           # clear before arming so a /stop or unlock after this sticks
             alarm_active = True                # enable continuous alarm
-            events.insert(0,[ts,'alarm'])      # prepend event
-            if len(events)>10: events.pop()
+            add_event(ts,'alarm')
+            uplink.push(ts, 'alarm')           # queue for collector
 
     if alarm_active:                            # if sweeping alarm active
         buzz.alarm()                            # perform frequency sweep
 
     prev_motion = motion                       # store current state
-    time.sleep_ms(50)                          # debounce delay
+    if not eff and not alarm_active and not motion and power.can_sleep():  # quiet after hours, PIR low (high would wake ext0 at once)
+        power.sleep(min(HEARTBEAT_MS, (sched.recheck - sched.now())*1000))  # PIR, heartbeat or schedule recheck
+    else:
+        time.sleep_ms(50)                      # debounce delay
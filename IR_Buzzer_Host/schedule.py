@@ -0,0 +1,127 @@
+from machine import Timer   # one-shot wakeup at the next mode change
+import time, _thread        # local clock, lock shared with the web thread
+
+DAY = 86400                 # seconds per day
+MAX_SLEEP = 3600            # re-check at least hourly in case NTP moves the clock
+
+class Schedule:
+    """
+    Business-hours calendar for IR_Buzzer_Host.
+
+    The current mode and the time of the next change are computed once and
+    a one-shot Timer is armed for that moment, so reading the mode is just
+    an attribute lookup. The Timer callback is a soft IRQ that may interrupt
+    a thread holding the lock, so it only sets `due`; the main loop calls
+    update() when it sees the flag, one pass after the boundary.
+
+    - rules: [(weekdays, 'HH:MM' open, 'HH:MM' close), ...], Monday = 0, open < close
+    - holidays: ['YYYY-MM-DD', ...] days that stay after-hours
+    - offset_s: local time = UTC + offset_s
+    - on_change: optional fn(business, next_change) called when the effective mode changes
+
+    Attributes read by the main loop and /status:
+    - business: effective mode (schedule + override)
+    - scheduled: what the weekly rules and holidays alone say
+    - next_change: local epoch seconds of the next effective change
+    - recheck: local seconds update() is next due; earlier than next_change
+               while an override outlasts a scheduled boundary
+    - override: (business, until local seconds) or None
+    - due: the Timer fired and update() has not run since
+    """
+
+    def __init__(self, rules, holidays=(), offset_s=0, on_change=None, timer_id=0):
+        self.week = [[] for _ in range(7)]     # weekday -> [(open s, close s), ...]
+        for days, start, end in rules:
+            for d in days:
+                self.week[d].append((self._clock(start), self._clock(end)))
+        self.holidays = set(tuple(int(x) for x in h.split('-')) for h in holidays)
+        self.offset_s = offset_s
+        self.on_change = on_change
+        self.override = None
+        self.business = self.scheduled = False
+        self.next_change = self.recheck = 0
+        self.due = False
+        self.lock = _thread.allocate_lock()
+        self.timer = Timer(timer_id)
+        self.update()
+
+    @staticmethod
+    def _clock(hhmm):
+        """'HH:MM' (00:00 to 24:00) -> seconds after midnight; ValueError otherwise."""
+        h, m = hhmm.split(':')                 # ValueError unless exactly one ':'
+        h, m = int(h), int(m)
+        if not (0 <= h <= 24 and 0 <= m < 60) or (h == 24 and m):
+            raise ValueError('bad time ' + hhmm)
+        return h * 3600 + m * 60
+
+    def now(self):
+        return time.time() + self.offset_s     # local epoch seconds
+
+    def at(self, hhmm):
+        """Next local time at `hhmm` (today if still ahead, else tomorrow)."""
+        now = self.now()
+        t = now - now % DAY + self._clock(hhmm)
+        return t if t > now else t + DAY
+
+    # ── overrides ──
+    def hold(self, business, until=None):
+        """Keep `business` mode until local time `until` (default: the next scheduled change)."""
+        with self.lock:
+            if until is None:
+                until = self._scheduled(self.now())[1]
+            self.override = (business, until)
+        self.update()
+
+    def resume(self):
+        with self.lock:
+            self.override = None
+        self.update()
+
+    # ── engine ──
+    def _scheduled(self, now):
+        """(business, next boundary) from the weekly rules and holidays alone."""
+        day0 = now - now % DAY
+        spans = []
+        for d in range(-1, 8):                 # yesterday through next week
+            base = day0 + d * DAY
+            tm = time.localtime(base)
+            if tm[0:3] in self.holidays:
+                continue
+            for start, end in self.week[tm[6]]:
+                spans.append((base + start, base + end))
+        spans.sort()
+        merged = []                            # 17:00-24:00 + 00:00-09:00 is one span
+        for start, end in spans:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            if now < start:
+                return False, start
+            if now < end:
+                return True, end
+        return False, day0 + 8 * DAY           # closed all week: look again later
+
+    def _fire(self, _timer):
+        self.due = True                        # soft IRQ: no lock, no allocation-heavy work
+
+    def update(self):
+        """Recompute the mode and arm the timer for the next change."""
+        with self.lock:
+            self.due = False
+            now = self.now()
+            self.scheduled, boundary = self._scheduled(now)
+            if self.override and now >= self.override[1]:
+                self.override = None           # timed override ran out
+            if self.override:
+                business, self.next_change = self.override
+            else:
+                business, self.next_change = self.scheduled, boundary
+            changed = business != self.business
+            self.business = business
+            self.recheck = min(self.next_change, boundary)  # keeps `scheduled` current under an override
+            wait = min(max(self.recheck - now, 1), MAX_SLEEP)
+            self.timer.init(mode=Timer.ONE_SHOT, period=wait * 1000, callback=self._fire)
+        if changed and self.on_change:
+            self.on_change(business, self.next_change)
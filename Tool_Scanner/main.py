@@ -1,6 +1,9 @@
 import network, ntptime, time, socket, _thread   # bring in Wi-Fi, NTP sync, timing, HTTP sockets, threading
 from machine import Pin                         # GPIO control for LEDs
 from mfrc522 import MFRC522                     # RC522 RFID reader driver
+from uplink import Uplink                       # batched event push to the collector
+from peerlink import PeerLink                   # motion gating from IR_Buzzer_Host
+from power import Power                         # idle light sleep
 
 # ─── USER CONFIG ────────────────────────────────────────────────────────────────
 SSID = "Berkeley-IoT"                         # Wi-Fi SSID
@@ -33,6 +36,19 @@ led_red   = Pin(13, mode=Pin.OUT)            # red LED output pin
 LOGFILE = 'log.csv'                          # CSV log filename
 PORT    = 80                                 # HTTP port for web server
 
+COLLECTOR_HOST = None                        # collector IP, None disables event push
+COLLECTOR_PORT = 9999                        # collector UDP ingest port
+PEER_PORT      = None                        # node-to-node UDP port, None disables motion gating
+PRESENCE_MS    = 60_000                      # keep the reader on this long after motion
+IR_STALE_MS    = 90_000                      # IR host silent this long -> poll regardless
+GATE_POLL_MS   = 20                          # loop period while the reader is gated off
+POWER_SAVE     = False                       # light-sleep between polls when idle (web UI only in wake windows)
+IDLE_AFTER_MS  = 60_000                      # no taps this long -> start sleeping
+SLEEP_POLL_MS  = 100                         # one reader poll per light-sleep slice while idle
+FIELD_ON_MS    = 5                           # tag power-up after the antenna comes on (ISO 14443-3)
+WAKE_EVERY_S   = 900                         # periodic wake window for uploads, NTP, web UI
+WAKE_WINDOW_MS = 15_000                      # how long each wake window stays up
+
 # ─── WIFI & TIME ───────────────────────────────────────────────────────────────
 def connect_wifi():
     wlan = network.WLAN(network.STA_IF)       # create station WLAN interface
@@ -94,11 +110,15 @@ def log_access(uid, username):
     ts = timestamp()                        # generate timestamp string
     with open(LOGFILE, 'a') as f:
         f.write("{},{},{},{}\n".format(ts, uid, username, state))  # append new row
+    uplink.push(ts, 'tap', uid, username, state)  # queue for collector (never blocks)
     print("Logged:", uid, username, state, "at", ts)  # console feedback
 
 # ─── RFID SETUP ─────────────────────────────────────────────────────────────────
 rfid = MFRC522(SCK, MOSI, MISO, RST, CS)    # initialize RFID reader hardware
 seen = set()                                # track seen UIDs to mark new vs repeat
+uplink = Uplink(COLLECTOR_HOST, COLLECTOR_PORT, 'tool')  # event push to collector
+peers = PeerLink(PEER_PORT, 'tool')          # motion announcements from IR_Buzzer_Host
+power = Power(POWER_SAVE, None, IDLE_AFTER_MS, WAKE_EVERY_S, WAKE_WINDOW_MS, sync_time)  # timer wake only
 
 # ─── WEB SERVER ────────────────────────────────────────────────────────────────
 def web_server():
@@ -195,19 +215,43 @@ def web_server():
 """)  # serve viewer page
         cl.close()                              # ensure connection closed
 
+# ─── MOTION GATING ─────────────────────────────────────────────────────────────
+def someone_present():
+    # poll while IR_Buzzer_Host reports motion, or whenever it has gone quiet (fail open)
+    return peers.recent('motion', PRESENCE_MS) or not peers.alive('ir', IR_STALE_MS)
+
 # ─── MAIN ───────────────────────────────────────────────────────────────────────
 def main():
     ip = connect_wifi()                       # join Wi-Fi
     sync_time()                               # sync RTC
     _thread.start_new_thread(web_server, ())  # run web server in background
+    uplink.start()                            # background collector push
+    peers.start()                             # peer receiver thread
 
     print("RFID scanner ready. Visit http://{}/ to view live log.".format(ip))
+    antenna = True                            # init() leaves the antenna on
     while True:
+        asleep = power.can_sleep() and not peers.recent('motion', PRESENCE_MS)  # idle: one poll per light-sleep slice
+        if not someone_present():             # empty shop: antenna off, no polling
+            if antenna:
+                rfid.antenna_on(False); antenna = False
+            if asleep:
+                power.sleep(SLEEP_POLL_MS)     # idle too: sleep the slice, field stays off
+            else:
+                time.sleep_ms(GATE_POLL_MS)
+            continue
+        if not antenna:
+            rfid.antenna_on(True); antenna = True  # motion or next sleep slice: field back on
+            time.sleep_ms(FIELD_ON_MS)        # a REQA sooner goes unanswered
         status, _ = rfid.request(rfid.REQIDL) # poll for tag presence
         if status == rfid.OK:
             status, raw = rfid.anticoll()     # anti-collision UID read
             if status == rfid.OK:
                 uid = "".join("{:02X}".format(b) for b in raw)  # format UID hex
+                woke = power.ready()        # upper bound: ms from sleep start to this read
+                power.activity()            # stay awake for the next few taps
+                if woke is not None:
+                    print("sleep->ready", woke, "ms")
 
                 if uid not in seen:
                     print("✔ New tag:", uid)
@@ -226,7 +270,11 @@ def main():
                     led_red.value(1); time.sleep_ms(500); led_red.value(0)      # blink red
                     log_access(uid, user)    # record failed attempt
 
-        time.sleep_ms(200)                     # short delay to debounce
+        if asleep:
+            rfid.antenna_on(False); antenna = False  # field off while the CPU sleeps
+            power.sleep(SLEEP_POLL_MS)        # timer wake for the next poll
+        else:
+            time.sleep_ms(200)                 # short delay to debounce
 
 if __name__ == "__main__":
     main()                                    # start the application
@@ -0,0 +1,8 @@
+"""
+Offline analytics over downloaded cabinet logs (CPython + NumPy).
+
+Node log.csv files are parsed in chunks into columnar arrays (see loader.Log)
+and every report in report.py is computed with vectorized NumPy operations.
+"""
+from .loader import Log, read_csv, read_collector, cached
+from . import report
@@ -0,0 +1,98 @@
+import argparse, json, sys, time   # analytics CLI
+
+import numpy as np
+
+from . import report
+from .loader import Log, cached, parse_timestamps, read_collector
+
+
+def load(args):
+    """Group every input by node kind; several downloads of one node are merged."""
+    logs = {'tool': [], 'id': [], 'ir': []}
+    for path in args.logs:
+        log = cached(path, args.cache)
+        logs[log.kind].append(log)
+    if args.db:
+        for kind, log in read_collector(args.db).items():
+            logs[kind].append(log)
+    return {k: Log.concat(k, v) if len(v) > 1 else (v[0] if v else None) for k, v in logs.items()}
+
+
+def parse_now(text):
+    return int(parse_timestamps(np.frombuffer(text.encode(), np.uint8).reshape(1, 19))[0])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m analytics',
+                                 description='Checkout, utilization, access and motion reports from cabinet logs.')
+    ap.add_argument('logs', nargs='*', help="log.csv files (layout detected from the header)")
+    ap.add_argument('--db', help='also read events from a collector database')
+    ap.add_argument('--cache', metavar='DIR', help='keep parsed columns here for repeat runs')
+    ap.add_argument('--now', type=parse_now, help="local 'YYYY-MM-DD HH:MM:SS' for overdue checks "
+                                                 "(default: newest timestamp in the tool log)")
+    ap.add_argument('--overdue-hours', type=float, default=24)
+    ap.add_argument('--business', default='9-17', help='business hours for motion, e.g. 9-17')
+    ap.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = ap.parse_args(argv)
+    if not args.logs and not args.db:
+        ap.error('give at least one log.csv or --db')
+
+    t0 = time.perf_counter()
+    logs = load(args)
+    parsed = time.perf_counter() - t0
+    out = {'rows': {k: len(v) for k, v in logs.items() if v is not None}}
+
+    tool = logs['tool']
+    if tool is not None and len(tool):
+        now = args.now if args.now is not None else int(tool.t.max())
+        out['checkout_durations'] = report.checkout_durations(tool)
+        out['utilization'] = report.utilization(tool)
+        out['overdue'] = report.overdue(tool, now, args.overdue_hours)
+        out['tool_unrecognized'] = report.unauthorized(tool)
+    if logs['id'] is not None and len(logs['id']):
+        out['unauthorized'] = report.unauthorized(logs['id'])
+    if logs['ir'] is not None and len(logs['ir']):
+        start, end = (int(h) for h in args.business.split('-'))
+        out['after_hours_motion'] = report.after_hours_motion(logs['ir'], start, end)
+    out['seconds'] = {'parse': round(parsed, 3), 'total': round(time.perf_counter() - t0, 3)}
+
+    if args.json:
+        print(json.dumps(out, indent=2))
+    else:
+        print_report(out)
+    return 0
+
+
+def print_report(r):
+    print("rows:", ", ".join("{}={}".format(k, v) for k, v in r['rows'].items()),
+          " ({parse}s parse, {total}s total)".format(**r['seconds']))
+    if 'checkout_durations' in r:
+        print("\nCheckout durations (minutes)")
+        print("  {:<18} {:>6} {:>8} {:>8} {:>8} {:>8}".format('tool', 'count', 'median', 'mean', 'p90', 'max'))
+        for d in r['checkout_durations']:
+            print("  {:<18} {checkouts:>6} {median_min:>8} {mean_min:>8} {p90_min:>8} {max_min:>8}".format(
+                d['tool'] or d['uid'], **d))
+        u = r['utilization']
+        print("\nCheck-outs by hour:   ", ' '.join('{:>3}'.format(h) for h in range(24)))
+        print("                      ", ' '.join('{:>3}'.format(c) for c in u['checkouts_by_hour']))
+        print("Mean tools out by hr: ", ' '.join('{:>3.0f}'.format(c) for c in u['mean_tools_out_by_hour']))
+        print("Check-outs by weekday:", ', '.join('{} {}'.format(k, v) for k, v in u['checkouts_by_weekday'].items()))
+        print("\nOverdue tools:", len(r['overdue']))
+        for o in r['overdue']:
+            print("  {tool:<18} {uid:<12} out since {out_since} ({hours_out} h)".format(**o))
+    for key, title in (('unauthorized', 'Unauthorized ID taps'), ('tool_unrecognized', 'Unrecognized tool tags')):
+        if key in r:
+            a = r[key]
+            print("\n{}: {} of {} ({:.2%})".format(title, a['unauthorized'], a['taps'], a['rate']))
+            for t in a['top_uids'][:5]:
+                print("  {uid:<12} {attempts}".format(**t))
+    if 'after_hours_motion' in r:
+        m = r['after_hours_motion']
+        print("\nAfter-hours motion: {} of {} events".format(m['after_hours'], m['events']),
+              m['by_type'])
+        for day, n in list(m['daily'].items())[-14:]:
+            print("  {} {}".format(day, n))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import hashlib, os, sqlite3   # log parsing into columnar arrays
+
+import numpy as np
+
+STATES = ['', 'Checked Out', 'Checked In']     # state column codes
+CHUNK_BYTES = 8 << 20                          # parse this much CSV at a time
+
+
+# ─── COLUMNAR LOG ──────────────────────────────────────────────────────────────
+class Log:
+    """
+    One node log as parallel NumPy columns.
+
+    - kind: 'tool' (timestamp,uid,username,state), 'id' (timestamp,uid,username)
+            or 'ir' (timestamp,type as shown on the IR_Buzzer_Host dashboard)
+    - t: int64 seconds of the node's *local* wall clock (as logged, no tz applied)
+    - uid, name: int32 codes into self.uids / self.names
+    - state: int8 code into STATES
+    """
+
+    def __init__(self, kind, t, uid, name, state, uids, names):
+        self.kind = kind
+        self.t, self.uid, self.name, self.state = t, uid, name, state
+        self.uids, self.names = list(uids), list(names)
+
+    def __len__(self):
+        return len(self.t)
+
+    def save(self, path):
+        np.savez(path, kind=self.kind, t=self.t, uid=self.uid, name=self.name, state=self.state,
+                 uids=np.array(self.uids, dtype=str), names=np.array(self.names, dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        z = np.load(path)
+        return cls(str(z['kind']), z['t'], z['uid'], z['name'], z['state'],
+                   z['uids'].tolist(), z['names'].tolist())
+
+    @classmethod
+    def concat(cls, kind, parts):
+        """Merge logs of one kind (e.g. several downloads) re-coding the dictionaries."""
+        uids, names = {}, {}
+        cols = {'t': [], 'uid': [], 'name': [], 'state': []}
+        for p in parts:
+            umap = np.array([uids.setdefault(u, len(uids)) for u in p.uids] or [0], dtype=np.int32)
+            nmap = np.array([names.setdefault(n, len(names)) for n in p.names] or [0], dtype=np.int32)
+            cols['t'].append(p.t)
+            cols['uid'].append(umap[p.uid])
+            cols['name'].append(nmap[p.name])
+            cols['state'].append(p.state)
+        cols = {k: np.concatenate(v) if v else np.zeros(0, dtype=np.int64) for k, v in cols.items()}
+        order = np.argsort(cols['t'], kind='stable')
+        return cls(kind, cols['t'][order], cols['uid'][order].astype(np.int32),
+                   cols['name'][order].astype(np.int32), cols['state'][order].astype(np.int8),
+                   uids, names)
+
+
+# ─── PARSING ───────────────────────────────────────────────────────────────────
+def parse_timestamps(ts):
+    """
+    Vectorized 'YYYY-MM-DD HH:MM:SS' -> epoch-style seconds.
+    ts: uint8 array of shape (n, 19). Uses the days-from-civil formula so no
+    per-row Python datetime objects are created.
+    """
+    d = ts.astype(np.int64) - 48
+    Y = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+    M = d[:, 5] * 10 + d[:, 6]
+    D = d[:, 8] * 10 + d[:, 9]
+    secs = (d[:, 11] * 10 + d[:, 12]) * 3600 + (d[:, 14] * 10 + d[:, 15]) * 60 + d[:, 17] * 10 + d[:, 18]
+    y = Y - (M <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * np.where(M > 2, M - 3, M + 9) + 2) // 5 + D - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return (era * 146097 + doe - 719468) * 86400 + secs
+
+
+class _Builder:
+    """Accumulates parsed chunks; dictionary-encodes the string columns as it goes."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.uids, self.names = {}, {}
+        self.states = {s.encode(): i for i, s in enumerate(STATES)}
+        self.parts = []
+
+    def add(self, rows):
+        rows = [r for r in rows if len(r) >= 2 and len(r[0]) == 19]  # drop headers / torn lines
+        if not rows:
+            return
+        ts = np.frombuffer(b''.join(r[0] for r in rows), dtype=np.uint8).reshape(-1, 19)
+        uids, names, states = self.uids, self.names, self.states
+        if self.kind == 'ir':                  # timestamp,type
+            uid = np.zeros(len(rows), dtype=np.int32)
+            uids.setdefault(b'', 0)
+            name = [names.setdefault(r[1], len(names)) for r in rows]
+        else:
+            uid = [uids.setdefault(r[1], len(uids)) for r in rows]
+            name = [names.setdefault(r[2] if len(r) > 2 else b'', len(names)) for r in rows]
+        state = [states.get(r[3], 0) if len(r) > 3 else 0 for r in rows]
+        self.parts.append((parse_timestamps(ts), np.asarray(uid, dtype=np.int32),
+                           np.asarray(name, dtype=np.int32), np.asarray(state, dtype=np.int8)))
+
+    def build(self):
+        cols = list(zip(*self.parts)) or [[np.zeros(0, np.int64)], [np.zeros(0, np.int32)],
+                                          [np.zeros(0, np.int32)], [np.zeros(0, np.int8)]]
+        t, uid, name, state = (np.concatenate(c) for c in cols)
+        return Log(self.kind, t, uid, name, state, self.uids, self.names)
+
+
+def detect_kind(header):
+    cols = [c.strip().lower() for c in header.split(',')]
+    if 'state' in cols:
+        return 'tool'
+    if 'type' in cols:
+        return 'ir'
+    return 'id'
+
+
+def read_csv(path, kind=None, chunk_bytes=CHUNK_BYTES):
+    """Stream a node log.csv in fixed-size chunks; memory is one chunk plus the columns."""
+    with open(path, 'rb') as f:
+        header = f.readline().decode('utf-8', 'replace')
+        b = _Builder(kind or detect_kind(header))
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            b.add([line.rstrip(b'\r\n').split(b',') for line in lines])
+    return _decode(b.build())
+
+
+def _decode(log):
+    # dictionaries were built from bytes; expose them as str
+    log.uids = [u.decode('utf-8', 'replace') for u in log.uids]
+    log.names = [n.decode('utf-8', 'replace') for n in log.names]
+    return log
+
+
+def read_collector(db_path, chunk_rows=200000):
+    """Load every node's events from the collector database, one Log per node."""
+    db = sqlite3.connect(db_path)
+    builders = {'id': _Builder('id'), 'tool': _Builder('tool'), 'ir': _Builder('ir')}
+    cur = db.execute("SELECT node, ts, uid, name, state, kind FROM events "
+                     "WHERE kind IN ('tap', 'alert', 'alarm') ORDER BY t, id")
+    while True:
+        rows = cur.fetchmany(chunk_rows)
+        if not rows:
+            break
+        for node, b in builders.items():
+            sel = [r for r in rows if r[0] == node]
+            if node == 'ir':
+                b.add([[(r[1] or '').encode(), r[5].encode()] for r in sel])
+            else:
+                b.add([[(r[1] or '').encode(), (r[2] or '').encode(), (r[3] or '').encode(),
+                        (r[4] or '').encode()] for r in sel])
+    return {k: _decode(b.build()) for k, b in builders.items()}
+
+
+# ─── CACHE ─────────────────────────────────────────────────────────────────────
+def cached(path, cache_dir, kind=None):
+    """read_csv with an .npz cache keyed on path, size and mtime."""
+    if not cache_dir:
+        return read_csv(path, kind)
+    st = os.stat(path)
+    key = hashlib.sha1('{}|{}|{}|{}'.format(os.path.abspath(path), st.st_size, st.st_mtime_ns,
+                                             kind).encode()).hexdigest()[:16]
+    npz = os.path.join(cache_dir, key + '.npz')
+    if os.path.exists(npz):
+        return Log.load(npz)
+    log = read_csv(path, kind)
+    os.makedirs(cache_dir, exist_ok=True)
+    log.save(npz)
+    return log
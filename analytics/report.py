@@ -0,0 +1,127 @@
+import numpy as np   # vectorized log analytics
+
+from .loader import STATES
+
+OUT, IN = STATES.index('Checked Out'), STATES.index('Checked In')
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+UNAUTHORIZED = ('Unauthorized', 'Unrecognized Tool')   # names the scanners log for unknown tags
+
+
+def hour_of_day(t):
+    return (t // 3600) % 24
+
+
+def day_of_week(t):
+    return (t // 86400 + 3) % 7                # 1970-01-01 was a Thursday; Monday = 0
+
+
+# ─── CHECKOUTS ─────────────────────────────────────────────────────────────────
+def checkout_intervals(log):
+    """
+    Pair each 'Checked Out' with the next event for the same tool when that is a
+    'Checked In'. Returns (uid codes, start, end) arrays.
+    """
+    if len(log) == 0:
+        return (np.zeros(0, np.int32),) + (np.zeros(0, np.int64),) * 2
+    order = np.lexsort((log.t, log.uid))       # group by tool, then time
+    uid, t, st = log.uid[order], log.t[order], log.state[order]
+    pair = (uid[:-1] == uid[1:]) & (st[:-1] == OUT) & (st[1:] == IN)
+    idx = np.nonzero(pair)[0]
+    return uid[idx], t[idx], t[idx + 1]
+
+
+def checkout_durations(log):
+    """Per-tool checkout count and duration stats in minutes."""
+    uid, start, end = checkout_intervals(log)
+    minutes = (end - start) / 60.0
+    out = []
+    order = np.argsort(uid, kind='stable')
+    uid, minutes = uid[order], minutes[order]
+    bounds = np.flatnonzero(np.diff(uid)) + 1
+    for u, m in zip(uid[np.r_[0, bounds]] if len(uid) else [], np.split(minutes, bounds)):
+        out.append({'uid': log.uids[u], 'tool': _tool_name(log, u), 'checkouts': int(len(m)),
+                    'median_min': round(float(np.median(m)), 1), 'mean_min': round(float(m.mean()), 1),
+                    'p90_min': round(float(np.percentile(m, 90)), 1), 'max_min': round(float(m.max()), 1)})
+    return sorted(out, key=lambda r: -r['checkouts'])
+
+
+def _tool_name(log, u):
+    names = log.name[log.uid == u]
+    return log.names[names[-1]] if len(names) else ''
+
+
+def utilization(log):
+    """
+    Check-outs per hour-of-day and weekday, plus the mean number of tools out
+    at each hour-of-day computed from the checkout intervals (minute resolution).
+    """
+    outs = log.t[log.state == OUT]
+    by_hour = np.bincount(hour_of_day(outs), minlength=24)
+    by_day = np.bincount(day_of_week(outs), minlength=7)
+
+    _, start, end = checkout_intervals(log)
+    tools_out = np.zeros(24)
+    if len(start):
+        base = start.min() // 60
+        s, e = start // 60 - base, end // 60 - base
+        span = int(e.max()) + 1
+        diff = np.bincount(s, minlength=span + 1) - np.bincount(e, minlength=span + 1)
+        occupancy = np.cumsum(diff[:-1])       # tools out during each minute
+        minute_hours = hour_of_day((base + np.arange(span)) * 60)
+        tools_out = np.bincount(minute_hours, occupancy, 24) / np.maximum(np.bincount(minute_hours, None, 24), 1)
+    return {'checkouts_by_hour': by_hour.tolist(),
+            'checkouts_by_weekday': dict(zip(DAYS, by_day.tolist())),
+            'mean_tools_out_by_hour': [round(float(x), 2) for x in tools_out]}
+
+
+def overdue(log, now, hours=24):
+    """Tools whose latest event is a check-out older than `hours` at local time `now`."""
+    if len(log) == 0:
+        return []
+    order = np.lexsort((log.t, log.uid))
+    uid = log.uid[order]
+    last = np.r_[uid[1:] != uid[:-1], True]    # last event of each tool
+    idx = order[last]
+    idx = idx[(log.state[idx] == OUT) & (now - log.t[idx] > hours * 3600)]
+    return sorted(({'uid': log.uids[log.uid[i]], 'tool': log.names[log.name[i]],
+                    'out_since': _fmt(log.t[i]), 'hours_out': round((now - int(log.t[i])) / 3600, 1)}
+                   for i in idx), key=lambda r: -r['hours_out'])
+
+
+# ─── ACCESS / MOTION ───────────────────────────────────────────────────────────
+def unauthorized(log, top=10):
+    """Share of taps that were unknown cards/tags, by day and the most frequent offenders."""
+    if len(log) == 0:
+        return {'taps': 0, 'unauthorized': 0, 'rate': 0.0, 'by_hour': [0] * 24, 'daily': {}, 'top_uids': []}
+    bad_codes = [i for i, n in enumerate(log.names) if n in UNAUTHORIZED]
+    bad = np.isin(log.name, bad_codes)
+    day = log.t // 86400
+    days, inv = np.unique(day, return_inverse=True)
+    taps_per_day = np.bincount(inv)
+    bad_per_day = np.bincount(inv, bad)
+    counts = np.bincount(log.uid[bad], minlength=len(log.uids))
+    worst = np.argsort(-counts)[:top]
+    return {'taps': int(len(log)), 'unauthorized': int(bad.sum()),
+            'rate': round(float(bad.mean()), 4),
+            'by_hour': np.bincount(hour_of_day(log.t[bad]), minlength=24).tolist(),
+            'daily': {_fmt(d * 86400)[:10]: round(float(b / n), 4)
+                      for d, b, n in zip(days, bad_per_day, taps_per_day) if b},
+            'top_uids': [{'uid': log.uids[u], 'attempts': int(counts[u])} for u in worst if counts[u]]}
+
+
+def after_hours_motion(log, start_hour=9, end_hour=17):
+    """IR_Buzzer_Host activations outside business hours, per day and per type."""
+    if len(log) == 0:
+        return {'events': 0, 'after_hours': 0, 'daily': {}, 'by_type': {}}
+    h = hour_of_day(log.t)
+    after = (h < start_hour) | (h >= end_hour)
+    days, counts = np.unique(log.t[after] // 86400, return_counts=True)
+    types = np.bincount(log.name[after], minlength=len(log.names))
+    return {'events': int(len(log)), 'after_hours': int(after.sum()),
+            'daily': {_fmt(d * 86400)[:10]: int(c) for d, c in zip(days, counts)},
+            'by_type': {log.names[i]: int(c) for i, c in enumerate(types) if c}}
+
+
+def _fmt(t):
+    d = np.datetime64(int(t), 's')
+    return str(d).replace('T', ' ')
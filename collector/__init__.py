@@ -0,0 +1,9 @@
+"""
+Central collector for the cabinet nodes (CPython).
+
+Nodes push batched events with uplink.py over UDP; the collector stores
+them in SQLite, acknowledges each batch after commit, and serves one
+merged dashboard plus a JSON query API.
+"""
+from .store import Store
+from .server import Collector
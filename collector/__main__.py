@@ -0,0 +1,83 @@
+import argparse, json, socket, sys, threading, time   # collector CLI
+
+from .server import Collector
+from .store import Store
+
+
+def serve(args):
+    store = Store(args.db)
+    c = Collector(store, udp=(args.bind, args.udp), http=(args.bind, args.http)).start()
+    print("Collector: UDP ingest on {}:{}, dashboard on http://{}:{}/".format(
+        *c.udp_addr, *c.http_addr))
+    try:
+        last = 0
+        while True:
+            time.sleep(10)
+            if c.stats['events'] != last:      # periodic ingest summary
+                last = c.stats['events']
+                print("events={events} batches={batches} duplicates={duplicates} bad={bad}".format(
+                    **c.stats))
+    except KeyboardInterrupt:
+        c.stop()
+
+
+def bench(args):
+    """Blast batches at a private collector from several fake nodes and time the commits."""
+    store = Store(args.db)
+    c = Collector(store, udp=('127.0.0.1', 0), http=('127.0.0.1', 0)).start()
+    per_node = args.events // args.nodes
+    batch = 16
+
+    def node(i):
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.settimeout(1.0)
+        boot, t = 1000 + i, int(time.time())
+        for first in range(1, per_node + 1, batch):
+            n = min(batch, per_node - first + 1)
+            ev = [[t, '', 'tap', 'A1745C3EB7', 'Tool 1', 'Checked Out'] for _ in range(n)]
+            s.sendto(json.dumps({'n': 'bench{}'.format(i), 'b': boot, 's': first, 'e': ev}).encode(),
+                     c.udp_addr)
+            if first // batch % args.window == 0:
+                try:
+                    s.recvfrom(128)            # crude flow control: one ack per window
+                except OSError:
+                    pass
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=node, args=(i,)) for i in range(args.nodes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    want = per_node * args.nodes
+    while c.stats['events'] + c.stats['duplicates'] < want and time.perf_counter() - t0 < 60:
+        time.sleep(0.01)
+    dt = time.perf_counter() - t0
+    c.stop()
+    print("ingested {} of {} events in {:.2f}s = {:.0f} events/s ({} batches)".format(
+        c.stats['events'], want, dt, c.stats['events'] / dt, c.stats['batches']))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m collector', description='Cabinet event collector.')
+    ap.add_argument('--db', default='cabinet.db', help='SQLite database file')
+    sub = ap.add_subparsers(dest='cmd')
+    p = sub.add_parser('serve', help='run the collector (default)')
+    p.add_argument('--bind', default='0.0.0.0')
+    p.add_argument('--udp', type=int, default=9999, help='UDP ingest port')
+    p.add_argument('--http', type=int, default=8000, help='dashboard / API port')
+    p = sub.add_parser('bench', help='measure ingest rate on this machine')
+    p.add_argument('--events', type=int, default=100000)
+    p.add_argument('--nodes', type=int, default=3)
+    p.add_argument('--window', type=int, default=8, help='batches sent per ack waited for')
+    args = ap.parse_args(argv)
+    if args.cmd == 'bench':
+        bench(args)
+    else:
+        if args.cmd is None:
+            args = ap.parse_args((argv or sys.argv[1:]) + ['serve'])
+        serve(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+import json, math, queue, socket, sqlite3, threading   # UDP ingest, HTTP API, writer thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from .sessions import holders
+
+# ─── DASHBOARD ─────────────────────────────────────────────────────────────────
+INDEX_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>Cabinet Collector</title>
+  <style>
+    body { font-family: sans-serif; padding: 1rem; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { border: 1px solid #ccc; padding: 0.5rem; }
+    th { background: #f4f4f4; }
+    select, input { margin: 0 0.5rem 1rem 0; }
+  </style>
+</head>
+<body>
+  <h1>Cabinet Events (all nodes)</h1>
+  <div id="nodes">Loading…</div>
+  <p>
+    Node <select id="node" onchange="loadEvents()">
+      <option value="">all</option><option>id</option><option>tool</option><option>ir</option>
+    </select>
+    UID <input id="uid" size="12" onchange="loadEvents()">
+  </p>
+  <div id="log">Loading…</div>
+  <script>
+    function loadNodes() {
+      fetch('api/nodes').then(r => r.json()).then(ns => {
+        document.getElementById('nodes').innerText = ns.map(n =>
+          `${n.node}: ${n.events} events, last ${new Date(n.last_received * 1000).toLocaleString()}`
+        ).join('  |  ');
+      });
+    }
+
+    function loadEvents() {
+      const q = new URLSearchParams({limit: 200});
+      const node = document.getElementById('node').value;
+      const uid = document.getElementById('uid').value.trim();
+      if (node) q.set('node', node);
+      if (uid) q.set('uid', uid);
+      fetch('api/events?' + q).then(r => r.json()).then(rows => {
+        let html = '<table><tr><th>Timestamp</th><th>Node</th><th>Event</th>'
+                 + '<th>UID</th><th>Name</th><th>State</th></tr>';
+        rows.forEach(e => {
+          html += `<tr><td>${e.ts}</td><td>${e.node}</td><td>${e.kind}</td>`
+                + `<td>${e.uid}</td><td>${e.name}</td><td>${e.state}</td></tr>`;
+        });
+        html += '</table>';
+        document.getElementById('log').innerHTML = html;
+      }).catch(() => {
+        document.getElementById('log').innerText = 'Error loading events.';
+      });
+    }
+
+    window.onload = () => { loadNodes(); loadEvents(); };
+    setInterval(() => { loadNodes(); loadEvents(); }, 5000);
+  </script>
+</body>
+</html>
+"""
+
+
+# ─── COLLECTOR ─────────────────────────────────────────────────────────────────
+INT64 = (-2 ** 63, 2 ** 63 - 1)                # SQLite INTEGER range
+
+
+def valid_batch(batch):
+    """True if `batch` has the shape add_batches() and the ack need: int boot/seq, list of event lists."""
+    if not isinstance(batch, dict):
+        return False
+    n, b, s, e = batch.get('n'), batch.get('b'), batch.get('s'), batch.get('e')
+    if not isinstance(n, str) or type(b) is not int or type(s) is not int or not isinstance(e, list):
+        return False
+    if not (INT64[0] <= b <= INT64[1] and INT64[0] <= s and s + len(e) <= INT64[1]):
+        return False                           # seq + i is stored too
+    for ev in e:                               # [t, ts, kind, uid, name, state], t numeric
+        if not isinstance(ev, list) or not ev or type(ev[0]) not in (int, float):
+            return False
+        if type(ev[0]) is float and not math.isfinite(ev[0]):
+            return False                       # json.loads accepts Infinity and NaN
+        if not INT64[0] <= ev[0] <= INT64[1]:
+            return False                       # int(t) must fit the t column
+    return True
+
+
+class Collector:
+    """
+    Receives node batches over UDP (or HTTP POST /ingest), writes them through
+    a single writer thread that commits many batches per transaction, and only
+    then acknowledges them. Serves the merged dashboard and query API over HTTP.
+
+    - store: collector.store.Store
+    - udp/http: (host, port) to listen on; port 0 picks a free one
+    """
+
+    MAX_DRAIN = 512                            # batches folded into one transaction
+
+    def __init__(self, store, udp=('0.0.0.0', 9999), http=('0.0.0.0', 8000)):
+        self.store = store
+        self.inbox = queue.Queue()
+        self.stats = {'batches': 0, 'events': 0, 'duplicates': 0, 'bad': 0}
+        self.running = threading.Event()
+
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)  # absorb bursts
+        self.udp.bind(udp)
+        self.udp.settimeout(0.5)
+        self.udp_addr = self.udp.getsockname()
+
+        handler = type('Handler', (_Handler,), {'collector': self})
+        self.http = ThreadingHTTPServer(http, handler)
+        self.http.daemon_threads = True
+        self.http_addr = self.http.server_address
+
+    # ── lifecycle ──
+    def start(self):
+        self.running.set()
+        for fn in (self._udp_loop, self._writer, self.http.serve_forever):
+            threading.Thread(target=fn, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running.clear()
+        self.http.shutdown()
+        self.inbox.put(None)                   # wake the writer
+
+    # ── ingest ──
+    def _udp_loop(self):
+        while self.running.is_set():
+            try:
+                data, addr = self.udp.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                batch = json.loads(data)
+            except ValueError:
+                batch = None
+            if not valid_batch(batch):
+                self.stats['bad'] += 1
+                continue
+            self.inbox.put((batch, addr, None))
+
+    def submit(self, batch):
+        """Synchronous ingest for HTTP callers: returns the ack once committed."""
+        done = threading.Event()
+        reply = {}
+        self.inbox.put((batch, None, (done, reply)))
+        done.wait(10)
+        return reply
+
+    def _writer(self):
+        while self.running.is_set():
+            item = self.inbox.get()
+            if item is None:
+                continue
+            items = [item]
+            while len(items) < self.MAX_DRAIN:  # fold whatever queued up meanwhile
+                try:
+                    item = self.inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    items.append(item)
+
+            try:
+                new = self.store.add_batches([b for b, _, _ in items])
+            except (sqlite3.Error, ValueError, TypeError, OverflowError):
+                items, new = self._add_each(items)  # one bad batch must not sink the rest
+            total = sum(len(b['e']) for b, _, _ in items)
+            self.stats['batches'] += len(items)
+            self.stats['events'] += new
+            self.stats['duplicates'] += total - new
+
+            for batch, addr, waiter in items:  # ack only after the commit
+                ack = {'b': batch['b'], 'a': batch['s'] + len(batch['e']) - 1}
+                if addr is not None:
+                    try:
+                        self.udp.sendto(json.dumps(ack).encode(), addr)
+                    except OSError:
+                        pass                   # node will retry, insert is idempotent
+                else:
+                    waiter[1].update(ack)
+                    waiter[0].set()
+
+    def _add_each(self, items):
+        """Insert batch by batch after a failed group commit; returns (committed items, new rows)."""
+        good, new = [], 0
+        for item in items:
+            batch, addr, waiter = item
+            try:
+                new += self.store.add_batches([batch])
+                good.append(item)
+            except (sqlite3.Error, ValueError, TypeError, OverflowError) as e:
+                self.stats['bad'] += 1         # never acked, dropped from the stats
+                print("dropped batch node={} boot={} seq={}: {}".format(batch['n'], batch['b'], batch['s'], e))
+                if waiter is not None:
+                    waiter[1]['error'] = 'bad batch'
+                    waiter[0].set()
+        return good, new
+
+
+class _Handler(BaseHTTPRequestHandler):
+    collector = None
+    protocol_version = 'HTTP/1.0'
+
+    def log_message(self, fmt, *args):
+        pass                                   # keep the console for ingest stats
+
+    def _send(self, code, body, ctype='application/json'):
+        if not isinstance(body, (bytes, str)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(code)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        store = self.collector.store
+        try:
+            if url.path == '/api/events':
+                rows = store.query(node=q.get('node'), uid=q.get('uid'), kind=q.get('kind'),
+                                   since=q.get('since'), until=q.get('until'),
+                                   limit=min(int(q.get('limit', 500)), 10000))
+                self._send(200, rows)
+            elif url.path == '/api/nodes':
+                self._send(200, store.nodes())
+            elif url.path == '/api/holders':
+                self._send(200, holders(store.conn()))
+            elif url.path == '/api/stats':
+                self._send(200, dict(self.collector.stats, queued=self.collector.inbox.qsize()))
+            elif url.path in ('/', '/index.html'):
+                self._send(200, INDEX_HTML, 'text/html; charset=utf-8')
+            else:
+                self._send(404, {'error': 'not found'})
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/ingest':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            batch = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError:
+            batch = None
+        if not valid_batch(batch):
+            self._send(400, {'error': 'bad batch'})
+            return
+        ack = self.collector.submit(batch)
+        self._send(400 if 'error' in ack else 200, ack)
@@ -0,0 +1,312 @@
+import argparse, bisect, calendar, csv, heapq, sys, time   # unlock/tool correlation
+
+# ─── SCHEMA ────────────────────────────────────────────────────────────────────
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    unlock_id INTEGER PRIMARY KEY,          -- event id of the ID-card unlock
+    uid       TEXT NOT NULL,
+    user      TEXT,
+    unlock_t  INTEGER NOT NULL,
+    close_t   INTEGER,                      -- door-switch close, NULL if never seen
+    end_t     INTEGER NOT NULL              -- end of the attribution window
+);
+CREATE TABLE IF NOT EXISTS checkouts (
+    event_id   INTEGER PRIMARY KEY,         -- Tool_Scanner event id
+    t          INTEGER NOT NULL,
+    tool_uid   TEXT NOT NULL,
+    tool       TEXT,
+    state      TEXT,
+    session_id INTEGER                      -- sessions.unlock_id, NULL if nobody had it open
+);
+CREATE INDEX IF NOT EXISTS checkouts_tool_t  ON checkouts (tool_uid, t);
+CREATE INDEX IF NOT EXISTS checkouts_session ON checkouts (session_id);
+CREATE INDEX IF NOT EXISTS sessions_unlock_t ON sessions (unlock_t);
+CREATE TABLE IF NOT EXISTS correlator_state (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+class Session:
+    __slots__ = ('id', 'uid', 'user', 'unlock', 'close', 'end')
+
+    def __init__(self, id, uid, user, unlock):
+        self.id, self.uid, self.user, self.unlock = id, uid, user, unlock
+        self.close = None
+        self.end = None
+
+
+# ─── CORRELATOR ────────────────────────────────────────────────────────────────
+class Correlator:
+    """
+    Joins ID_Scanner_Servo unlocks with Tool_Scanner check-outs/ins.
+
+    A session runs from an authorized unlock to the door-switch close plus
+    `grace` seconds; without a close it runs `max_open` seconds or until the
+    next unlock. A tool event belongs to the session with the latest unlock
+    whose window contains it.
+
+    Sessions and tool events are indexed by `bucket`-second time buckets, so
+    each event only looks at the handful of sessions in its own bucket and
+    the join stays linear in log size. Events may arrive out of order (nodes
+    push independently); anything within `horizon` seconds of the newest
+    event is still re-attributed when a window changes, older state is
+    dropped from memory.
+    """
+
+    def __init__(self, bucket=300, grace=60, max_open=1800, horizon=6 * 3600):
+        self.bucket, self.grace, self.max_open, self.horizon = bucket, grace, max_open, horizon
+        self.sessions = {}                     # unlock id -> Session (live only)
+        self.order = []                        # live (unlock t, unlock id), sorted
+        self.by_bucket = {}                    # bucket -> set of session ids
+        self.tools = {}                        # bucket -> [tool event dicts]
+        self.watermark = 0                     # newest event time seen
+        self._swept = None                     # last bucket dropped by _expire
+        self.dirty_sessions, self.dirty_events = {}, {}   # id -> Session / tool event
+        self.stats = {'sessions': 0, 'tool_events': 0, 'attributed': 0}
+
+    # ── feeding ──
+    def feed(self, e):
+        """e: dict with id, node, t, kind, uid, name, state (collector row shape)."""
+        t = int(e['t'])
+        if e['node'] == 'id' and e['kind'] == 'tap' and e.get('name') not in (None, '', 'Unauthorized'):
+            self._unlock(e['id'], e['uid'], e['name'], t)
+        elif e['node'] == 'id' and e['kind'] == 'close':
+            self._close(e['uid'], t)
+        elif e['node'] == 'tool' and e['kind'] == 'tap':
+            self._tool(dict(id=e['id'], t=t, uid=e['uid'], name=e.get('name'),
+                            state=e.get('state'), session=None))
+        if t > self.watermark:
+            self.watermark = t
+            self._expire()
+
+    def _buckets(self, start, end):
+        return range(start // self.bucket, end // self.bucket + 1)
+
+    def _window(self, s):
+        """Recompute s.end from its close time and the next unlock."""
+        end = s.close + self.grace if s.close is not None else s.unlock + self.max_open
+        i = bisect.bisect_right(self.order, (s.unlock, s.id))
+        if i < len(self.order) and s.close is None:
+            end = min(end, self.order[i][0])   # the next person opening the door ends it
+        return end
+
+    def _set_window(self, s):
+        old = s.end
+        s.end = self._window(s)
+        if old == s.end:
+            return
+        for b in self._buckets(s.unlock, max(s.end, old or s.end)):
+            if s.unlock <= (b + 1) * self.bucket and b * self.bucket <= s.end:
+                self.by_bucket.setdefault(b, set()).add(s.id)
+            else:
+                self.by_bucket.get(b, set()).discard(s.id)
+        self._reattribute(s.unlock, max(s.end, old or s.end))
+        self.dirty_sessions[s.id] = s
+
+    def _unlock(self, id, uid, user, t):
+        if id in self.sessions:
+            return                             # replayed event
+        s = self.sessions[id] = Session(id, uid, user, t)
+        bisect.insort(self.order, (t, id))
+        self.stats['sessions'] += 1
+        i = bisect.bisect_left(self.order, (t, id))
+        if i > 0:                              # previous session may now end earlier
+            self._set_window(self.sessions[self.order[i - 1][1]])
+        self._set_window(s)
+
+    def _close(self, uid, t):
+        # the close belongs to the latest unlock by that card before it
+        i = bisect.bisect_right(self.order, (t, float('inf')))
+        while i > 0:
+            i -= 1
+            s = self.sessions[self.order[i][1]]
+            if s.uid == uid:
+                if s.close is None or t < s.close:
+                    s.close = t
+                    self._set_window(s)
+                return
+
+    def _best(self, t):
+        best = None
+        for sid in self.by_bucket.get(t // self.bucket, ()):
+            s = self.sessions[sid]
+            if s.unlock <= t <= s.end and (best is None or (s.unlock, s.id) > (best.unlock, best.id)):
+                best = s
+        return best
+
+    def _tool(self, ev):
+        self.tools.setdefault(ev['t'] // self.bucket, []).append(ev)
+        self.stats['tool_events'] += 1
+        self._assign(ev)
+
+    def _assign(self, ev):
+        s = self._best(ev['t'])
+        sid = s.id if s else None
+        if (ev['session'] is None) != (sid is None):
+            self.stats['attributed'] += 1 if sid is not None else -1
+        ev['session'] = sid
+        self.dirty_events[ev['id']] = ev
+
+    def _reattribute(self, start, end):
+        for b in self._buckets(start, end):
+            for ev in self.tools.get(b, ()):
+                if start <= ev['t'] <= end:
+                    s = self._best(ev['t'])
+                    if (s.id if s else None) != ev['session']:
+                        self._assign(ev)
+
+    def _expire(self):
+        cutoff = self.watermark - self.horizon
+        while self.order and self.sessions[self.order[0][1]].end < cutoff:
+            _, sid = self.order.pop(0)
+            s = self.sessions.pop(sid)
+            for b in self._buckets(s.unlock, s.end):
+                self.by_bucket.get(b, set()).discard(sid)
+        last = cutoff // self.bucket - 1       # newest bucket wholly before the cutoff
+        if self._swept is None:
+            self._swept = min(self.tools, default=last + 1) - 1
+        while self._swept < last:              # walk each bucket boundary once
+            self._swept += 1
+            self.tools.pop(self._swept, None)
+            self.by_bucket.pop(self._swept, None)
+
+    # ── output ──
+    def flush(self, db):
+        """Upsert changed sessions and attributions into the correlation tables."""
+        rows = [(s.id, s.uid, s.user, s.unlock, s.close, s.end) for s in self.dirty_sessions.values()]
+        db.executemany('INSERT OR REPLACE INTO sessions VALUES (?,?,?,?,?,?)', rows)
+        db.executemany('INSERT OR REPLACE INTO checkouts VALUES (?,?,?,?,?,?)',
+                       [(e['id'], e['t'], e['uid'], e['name'], e['state'], e['session'])
+                        for e in self.dirty_events.values()])
+        self.dirty_sessions.clear()
+        self.dirty_events.clear()
+
+
+# ─── SOURCES ───────────────────────────────────────────────────────────────────
+def run_db(store, correlator=None, follow=False, interval=5.0):
+    """
+    Incrementally correlate the collector's events table. Progress (last event
+    id) is kept in correlator_state; on restart the last `horizon` of events is
+    replayed to rebuild the in-memory window before new rows are read.
+    """
+    db = store.conn()
+    db.executescript(SCHEMA)
+    c = correlator or Correlator()
+    state = dict(db.execute('SELECT key, value FROM correlator_state'))
+    last_id = state.get('last_id', 0)
+    if last_id:
+        for e in store.iter_events(since=state.get('watermark', 0) - c.horizon):
+            if e['id'] > last_id:
+                break
+            c.feed(e)
+        c.dirty_sessions.clear()
+        c.dirty_events.clear()                 # already stored, nothing changed
+    while True:
+        n = 0
+        for e in store.iter_events(after_id=last_id):
+            c.feed(e)
+            last_id = e['id']
+            n += 1
+            if n % 50000 == 0:
+                _commit(db, c, last_id)
+        _commit(db, c, last_id)
+        if not follow:
+            return c
+        time.sleep(interval)
+
+
+def _commit(db, c, last_id):
+    with db:
+        c.flush(db)
+        db.executemany('INSERT OR REPLACE INTO correlator_state VALUES (?,?)',
+                       [('last_id', last_id), ('watermark', c.watermark)])
+
+
+def read_csv(path, node, utc_offset_hours, first_id):
+    """Yield events from a node log.csv; timestamps are the node's local time."""
+    with open(path, newline='') as f:
+        rows = csv.reader(f)
+        next(rows, None)                       # header
+        for i, row in enumerate(rows):
+            if len(row) < 3:
+                continue
+            try:
+                local = calendar.timegm(time.strptime(row[0], '%Y-%m-%d %H:%M:%S'))
+            except ValueError:
+                continue
+            yield {'id': first_id + i, 'node': node, 't': int(local - utc_offset_hours * 3600),
+                   'kind': 'tap', 'uid': row[1], 'name': row[2],
+                   'state': row[3] if len(row) > 3 else ''}
+
+
+def run_csv(id_log, tool_log, id_offset=-8, tool_offset=-7, correlator=None):
+    """Correlate downloaded log.csv files; both are time-ordered so a merge is enough."""
+    c = correlator or Correlator()
+    events = heapq.merge(read_csv(id_log, 'id', id_offset, 1),
+                         read_csv(tool_log, 'tool', tool_offset, 1 << 40),
+                         key=lambda e: e['t'])
+    tools = {}
+    for e in events:
+        c.feed(e)
+        if e['node'] == 'tool':
+            tools[e['id']] = None
+        for eid, ev in c.dirty_events.items():
+            tools[eid] = (ev, c.sessions.get(ev['session']) if ev['session'] else None)
+        c.dirty_events.clear()
+        c.dirty_sessions.clear()
+    return c, [v for v in tools.values() if v]
+
+
+def holders(db):
+    """Tools whose latest event is a check-out, with the user it was attributed to."""
+    db.executescript(SCHEMA)
+    sql = ("SELECT c.tool_uid, c.tool, c.t, s.user, s.uid FROM checkouts c "
+           "LEFT JOIN sessions s ON s.unlock_id = c.session_id "
+           "WHERE c.state = 'Checked Out' AND c.t = "
+           "(SELECT MAX(t) FROM checkouts c2 WHERE c2.tool_uid = c.tool_uid) ORDER BY c.tool")
+    return [{'tool_uid': r[0], 'tool': r[1], 't': r[2], 'user': r[3], 'user_uid': r[4]}
+            for r in db.execute(sql)]
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m collector.sessions',
+                                 description='Attribute tool check-outs to the user who unlocked the cabinet.')
+    ap.add_argument('--db', default='cabinet.db', help='collector database')
+    ap.add_argument('--follow', action='store_true', help='keep correlating new events')
+    ap.add_argument('--id-log', help='ID_Scanner_Servo log.csv (offline mode)')
+    ap.add_argument('--tool-log', help='Tool_Scanner log.csv (offline mode)')
+    ap.add_argument('--id-offset', type=float, default=-8, help='UTC offset of the ID log timestamps')
+    ap.add_argument('--tool-offset', type=float, default=-7, help='UTC offset of the tool log timestamps')
+    ap.add_argument('--grace', type=int, default=60, help='seconds after door close still attributed')
+    ap.add_argument('--max-open', type=int, default=1800, help='session length when no close is seen')
+    ap.add_argument('--who', metavar='TOOL', help="answer 'who has TOOL?' (name or UID)")
+    args = ap.parse_args(argv)
+
+    c = Correlator(grace=args.grace, max_open=args.max_open)
+    if args.id_log or args.tool_log:
+        if not (args.id_log and args.tool_log):
+            ap.error('offline mode needs both --id-log and --tool-log')
+        c, rows = run_csv(args.id_log, args.tool_log, args.id_offset, args.tool_offset, c)
+        latest = {}
+        for ev, s in rows:
+            latest[ev['uid']] = (ev, s)
+        out = [{'tool_uid': uid, 'tool': ev['name'], 't': ev['t'], 'user': s.user if s else None}
+               for uid, (ev, s) in latest.items() if ev['state'] == 'Checked Out']
+    else:
+        from .store import Store
+        store = Store(args.db)
+        c = run_db(store, c, follow=args.follow)
+        out = holders(store.conn())
+
+    print("sessions={sessions} tool_events={tool_events} attributed={attributed}".format(**c.stats))
+    for h in sorted(out, key=lambda h: h['tool'] or ''):
+        if args.who and args.who not in (h['tool'], h['tool_uid']):
+            continue
+        when = time.strftime('%Y-%m-%d %H:%M', time.gmtime(h['t']))
+        print("{:<12} {:<12} out since {} UTC  by {}".format(h['tool'], h['tool_uid'], when,
+                                                             h['user'] or 'unknown'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import sqlite3, threading, time   # event database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id       INTEGER PRIMARY KEY,
+    node     TEXT    NOT NULL,              -- 'id', 'tool', 'ir'
+    boot     INTEGER NOT NULL,              -- node boot id, sequence numbers restart per boot
+    seq      INTEGER NOT NULL,
+    t        INTEGER NOT NULL,              -- node clock, UTC epoch seconds
+    ts       TEXT,                          -- timestamp string exactly as the node logged it
+    kind     TEXT    NOT NULL,              -- 'tap', 'alert', 'alarm', ...
+    uid      TEXT,
+    name     TEXT,
+    state    TEXT,
+    received REAL    NOT NULL,              -- collector clock
+    UNIQUE (node, boot, seq)
+);
+CREATE INDEX IF NOT EXISTS events_t      ON events (t);
+CREATE INDEX IF NOT EXISTS events_node_t ON events (node, t);
+CREATE INDEX IF NOT EXISTS events_uid_t  ON events (uid, t);
+"""
+
+COLUMNS = ('id', 'node', 'boot', 'seq', 't', 'ts', 'kind', 'uid', 'name', 'state', 'received')
+
+
+class Store:
+    """
+    SQLite event store. One writer connection (the ingest thread) and one
+    read connection per querying thread; WAL mode lets them run together.
+    Inserts are idempotent on (node, boot, seq), so retried batches are free.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        db = self.conn()
+        db.executescript(SCHEMA)
+        db.commit()
+
+    def conn(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')  # durable at checkpoint, fast commits
+            self._local.db = db
+        return db
+
+    # ── ingest ──
+    def add_batches(self, batches):
+        """
+        Insert many node batches in one transaction.
+        batches: [{'n': node, 'b': boot, 's': first seq, 'e': [[t, ts, kind, uid, name, state], ...]}]
+        Returns the number of new (non-duplicate) rows.
+        """
+        now = time.time()
+        rows = []
+        for b in batches:
+            node, boot, seq = b['n'], b['b'], b['s']
+            for i, e in enumerate(b['e']):
+                t, ts, kind, uid, name, state = (list(e) + [''] * 6)[:6]
+                rows.append((node, boot, seq + i, int(t), ts, kind, uid, name, state, now))
+        db = self.conn()
+        before = db.total_changes
+        with db:
+            db.executemany('INSERT OR IGNORE INTO events '
+                           '(node, boot, seq, t, ts, kind, uid, name, state, received) '
+                           'VALUES (?,?,?,?,?,?,?,?,?,?)', rows)
+        return db.total_changes - before
+
+    # ── queries ──
+    def query(self, node=None, uid=None, kind=None, since=None, until=None, limit=500):
+        """Newest-first events matching every filter that is not None."""
+        where, args = [], []
+        for col, val in (('node', node), ('uid', uid), ('kind', kind)):
+            if val is not None:
+                where.append(col + ' = ?')
+                args.append(val)
+        if since is not None:
+            where.append('t >= ?'); args.append(int(since))
+        if until is not None:
+            where.append('t < ?'); args.append(int(until))
+        sql = 'SELECT {} FROM events'.format(', '.join(COLUMNS))
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY t DESC, id DESC LIMIT ?'
+        args.append(int(limit))
+        return [dict(zip(COLUMNS, r)) for r in self.conn().execute(sql, args)]
+
+    def nodes(self):
+        """Per-node event count, newest event time and latest boot."""
+        sql = ('SELECT node, COUNT(*), MAX(t), MAX(received) FROM events GROUP BY node ORDER BY node')
+        return [{'node': n, 'events': c, 'last_t': t, 'last_received': r}
+                for n, c, t, r in self.conn().execute(sql)]
+
+    def iter_events(self, since=None, after_id=0, batch=10000):
+        """Oldest-first scan in id order; used by offline stages that follow the log."""
+        sql = 'SELECT {} FROM events WHERE id > ?'.format(', '.join(COLUMNS))
+        args = [after_id]
+        if since is not None:
+            sql += ' AND t >= ?'
+            args.append(int(since))
+        sql += ' ORDER BY id LIMIT ?'
+        while True:
+            rows = self.conn().execute(sql, args + [batch]).fetchall()
+            if not rows:
+                return
+            for r in rows:
+                yield dict(zip(COLUMNS, r))
+            args[0] = rows[-1][0]
@@ -136,8 +136,9 @@ class MFRC522:
         self._wreg(0x01, 0x0F)
 
     def antenna_on(self, on=True):
-        if on and not (self._rreg(0x14) & 0x03):
-            self._sflags(0x14, 0x03)
+        if on:
+            if not (self._rreg(0x14) & 0x03):
+                self._sflags(0x14, 0x03)
         else:
             self._cflags(0x14, 0x03)
 
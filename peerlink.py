@@ -0,0 +1,143 @@
+import socket, time, _thread, os               # UDP broadcast, timing, receiver thread
+try:
+    import ujson as json                       # MicroPython
+except ImportError:
+    import json                                # CPython (simulator, tests)
+
+class PeerLink:
+    """
+    Node-to-node event broadcast on the shop LAN: IR_Buzzer_Host announces
+    motion and its armed state, ID_Scanner_Servo announces card unlocks.
+
+    publish() sends one datagram to the broadcast address straight away and
+    repeats it at RETRY_MS offsets, so a lost packet costs one retry gap
+    instead of the event. Every message carries the sender's boot id and a
+    sequence number; receivers drop repeats with a per-sender window, so
+    each handler runs once per event.
+
+    - port: UDP port shared by all nodes, or None to disable (publish is a
+            no-op and alive() is always False)
+    - node: this node's name ('id', 'tool', 'ir'); own broadcasts are ignored
+    """
+
+    RETRY_MS  = (20, 60, 150)                  # resend offsets after the first copy
+    WINDOW    = 32                             # duplicate window per sender (messages)
+    IDLE      = 0.05                           # receiver timeout when no resend is due
+
+    def __init__(self, port, node, broadcast='255.255.255.255'):
+        self.port = port
+        self.node = node
+        self.addr = (broadcast, port)
+        self.boot = int.from_bytes(os.urandom(4), 'big') & 0x7FFFFFFF  # tells reboots apart
+        self.seq = 0                           # last sequence number sent
+        self.sock = None
+        self.pending = []                      # [due ticks, retry index, datagram]
+        self.handlers = {}                     # kind -> fn(value, node)
+        self.last = {}                         # kind -> (ticks received, value, node)
+        self.heard = {}                        # node -> ticks of its latest message
+        self.windows = {}                      # node -> [boot, top seq, seen bitmask]
+        self.lock = _thread.allocate_lock()
+
+    def on(self, kind, fn):
+        self.handlers[kind] = fn               # called from the receiver thread
+
+    def start(self):
+        if not self.port:
+            return
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        s.bind(('0.0.0.0', self.port))
+        self.sock = s
+        _thread.start_new_thread(self._run, ())
+
+    def publish(self, kind, value=1):
+        if not self.sock:
+            return
+        with self.lock:
+            self.seq += 1
+            msg = json.dumps({'n': self.node, 'b': self.boot, 'q': self.seq, 'k': kind, 'v': value})
+            self.pending.append([time.ticks_add(time.ticks_ms(), self.RETRY_MS[0]), 0, msg])
+        self._send(msg)                        # first copy from the caller, no thread hop
+
+    # ── queries (main loop) ──
+    # ticks_diff() turns negative once ticks_ms wraps (~6.2 days after the
+    # event), so a negative age counts as stale rather than as just now
+    def recent(self, kind, within_ms):
+        """True if `kind` arrived from a peer in the last within_ms."""
+        last = self.last.get(kind)
+        return last is not None and 0 <= time.ticks_diff(time.ticks_ms(), last[0]) < within_ms
+
+    def alive(self, node, within_ms):
+        """True if `node` has sent anything (events or heartbeats) in the last within_ms."""
+        t = self.heard.get(node)
+        return t is not None and 0 <= time.ticks_diff(time.ticks_ms(), t) < within_ms
+
+    # ── receiver thread ──
+    def _send(self, msg):
+        try:
+            self.sock.sendto(msg, self.addr)
+        except OSError:
+            pass                               # Wi-Fi down; retries or the next event cover it
+
+    def _resend(self):
+        """Send repeats that are due; returns seconds until the next one."""
+        now = time.ticks_ms()
+        wait = self.IDLE
+        with self.lock:
+            due = [p for p in self.pending if time.ticks_diff(p[0], now) <= 0]
+            for p in due:
+                p[1] += 1
+                if p[1] < len(self.RETRY_MS):
+                    p[0] = time.ticks_add(p[0], self.RETRY_MS[p[1]] - self.RETRY_MS[p[1] - 1])
+            self.pending = [p for p in self.pending if p[1] < len(self.RETRY_MS)]
+            for p in self.pending:
+                wait = min(wait, max(0, time.ticks_diff(p[0], now)) / 1000)
+        for p in due:
+            self._send(p[2])
+        return wait
+
+    def _run(self):
+        while True:
+            self.sock.settimeout(self._resend() or 0.001)
+            try:
+                data, _ = self.sock.recvfrom(256)
+            except OSError:
+                continue                       # timeout: time to resend
+            self._receive(data)
+
+    def _receive(self, data):
+        try:
+            m = json.loads(data)
+            node, boot, seq = m['n'], m['b'], m['q']
+        except (ValueError, KeyError, TypeError):
+            return
+        if node == self.node:
+            return                             # our own broadcast looped back
+        now = time.ticks_ms()
+        self.heard[node] = now
+        if not self._fresh(node, boot, seq):
+            return                             # repeat of an event already handled
+        kind, value = m.get('k'), m.get('v')
+        self.last[kind] = (now, value, node)
+        fn = self.handlers.get(kind)
+        if fn:
+            try:
+                fn(value, node)
+            except Exception as e:
+                print("peer handler", kind, "failed:", e)
+
+    def _fresh(self, node, boot, seq):
+        w = self.windows.get(node)
+        if w is None or w[0] != boot:          # first message or the peer rebooted
+            self.windows[node] = [boot, seq, 1]
+            return True
+        if seq > w[1]:
+            shift = seq - w[1]
+            w[2] = ((w[2] << shift) | 1) & ((1 << self.WINDOW) - 1) if shift < self.WINDOW else 1
+            w[1] = seq
+            return True
+        off = w[1] - seq
+        if off >= self.WINDOW or w[2] & (1 << off):
+            return False
+        w[2] |= 1 << off                       # late but new (reordered on the air)
+        return True
@@ -0,0 +1,92 @@
+import machine, time                           # light sleep, wake reason, ticks
+try:
+    import esp32                               # ext0 wake source (ESP32 port)
+except ImportError:
+    esp32 = None
+
+class Power:
+    """
+    Light sleep between events for a node whose main loop would otherwise
+    spin all night.
+
+    The node asks can_sleep() once per loop pass and, if allowed, calls
+    sleep(ms) instead of time.sleep_ms(ms). The CPU then stops until the
+    timeout or a wake source (ext0 on `wake_pin`, e.g. the PIR) fires. Wi-Fi,
+    the web server and the uplink/peer threads are stalled while asleep, so
+    every `wake_every_s` the node stays up for `window_ms` to catch up and
+    `on_window` runs (NTP resync etc.).
+
+    ready() reports an upper bound on how long the event that woke the node
+    waited before it was handled: from the ext0 wake for a pin wake (the
+    event is the wake; the chip's own wake-up is not visible to ticks_ms),
+    from the start of the sleep for a timer wake (the event arrived somewhere
+    in that slice). stats() keeps the totals.
+
+    - enabled: False makes can_sleep() always False (the plain busy loop)
+    - wake_pin: Pin that wakes the CPU while high, or None (timer wake only)
+    - idle_after_ms: stay awake this long after the last activity()
+    """
+
+    def __init__(self, enabled, wake_pin=None, idle_after_ms=60_000, wake_every_s=900,
+                 window_ms=15_000, on_window=None):
+        self.enabled = enabled
+        self.idle_after_ms = idle_after_ms
+        self.wake_every_ms = wake_every_s * 1000
+        self.window_ms = window_ms
+        self.on_window = on_window
+        now = time.ticks_ms()
+        self.last_activity = now
+        self.window_start = now                # boot counts as a wake window
+        self.woke = None                       # ticks the pending event is timed from, until ready()
+        self.sleeps = self.slept_ms = 0
+        self.ready_n = self.ready_total = self.ready_max = 0
+        if enabled and wake_pin is not None:
+            esp32.wake_on_ext0(pin=wake_pin, level=esp32.WAKEUP_ANY_HIGH)
+
+    def activity(self):
+        self.last_activity = time.ticks_ms()   # tap, motion, alarm: stay up a while
+
+    def can_sleep(self):
+        if not self.enabled:
+            return False
+        now = time.ticks_ms()
+        since = time.ticks_diff(now, self.window_start)
+        if not 0 <= since < self.wake_every_ms:  # negative: ticks_ms wrapped
+            self.window_start = now            # open the next wake window
+            if self.on_window:
+                self.on_window()
+        idle = time.ticks_diff(now, self.last_activity)
+        if not 0 <= idle < self.idle_after_ms:
+            self.last_activity = time.ticks_add(now, -self.idle_after_ms)  # cap the age so it never wraps
+        if time.ticks_diff(now, self.window_start) < self.window_ms or 0 <= idle < self.idle_after_ms:
+            self.woke = None                   # awake on purpose: not a wake latency
+            return False
+        return True
+
+    def sleep(self, ms):
+        """Light-sleep up to `ms` or until a wake source fires; returns machine.wake_reason()."""
+        left = self.wake_every_ms - time.ticks_diff(time.ticks_ms(), self.window_start)
+        t0 = time.ticks_ms()
+        machine.lightsleep(max(1, min(int(ms), left)))  # timer wake never overruns the next window
+        now = time.ticks_ms()
+        reason = machine.wake_reason()
+        self.woke = now if reason == machine.PIN_WAKE else t0  # ext0: the event; timer: any time in the slice
+        self.sleeps += 1
+        self.slept_ms += time.ticks_diff(now, t0)
+        return reason
+
+    def ready(self):
+        """Call once the event that woke the node is handled; returns sleep-to-ready ms or None."""
+        if self.woke is None:
+            return None
+        ms = time.ticks_diff(time.ticks_ms(), self.woke)
+        self.woke = None
+        self.ready_n += 1
+        self.ready_total += ms
+        self.ready_max = max(self.ready_max, ms)
+        return ms
+
+    def stats(self):
+        return {'sleeps': self.sleeps, 'slept_ms': self.slept_ms, 'ready_n': self.ready_n,
+                'ready_avg_ms': self.ready_total // self.ready_n if self.ready_n else 0,
+                'ready_max_ms': self.ready_max}
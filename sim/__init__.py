@@ -0,0 +1,10 @@
+"""
+Host-side (CPython) stand-ins for the ESP32 nodes.
+
+Each node's main.py runs unchanged against a simulated board: fake
+Pin/PWM/SPI/Timer/WLAN, a register-level RC522 emulator, a virtual PIR and a
+door switch, all driven by a shared (optionally accelerated) clock.
+"""
+from .clock import Clock, Halt
+from .board import Board, PROFILES
+from .rc522 import RC522, Card, crc_a
@@ -0,0 +1,50 @@
+import argparse, sys   # CLI for running one node interactively
+
+from .board import Board, PROFILES
+from .clock import Clock
+
+USAGE = """commands:
+  tap UID [ms]     hold a card on the reader (default 250 ms)
+  motion [ms]      trigger the PIR (default 2000 ms)
+  door open|close  move the door switch
+  quit"""
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim',
+                                 description="Run one node's main.py on a simulated ESP32.")
+    ap.add_argument('node', choices=sorted(PROFILES))
+    ap.add_argument('--port', type=int, default=8080, help='host port for the node web server')
+    ap.add_argument('--fs', help='directory used as the board filesystem (default: temp dir)')
+    ap.add_argument('--speed', type=float, default=1.0, help='virtual seconds per real second')
+    args = ap.parse_args(argv)
+
+    clock = Clock(speed=args.speed)
+    board = Board(args.node, clock, fs_root=args.fs, ports={80: args.port}).start()
+    print("filesystem:", board.fs_root)
+    print(USAGE)
+
+    for line in sys.stdin:                     # drive the virtual peripherals from stdin
+        cmd = line.split()
+        if not cmd:
+            continue
+        try:
+            if cmd[0] == 'tap' and board.rfid:
+                board.rfid.present(cmd[1])
+                clock.sleep(int(cmd[2]) / 1000 if len(cmd) > 2 else 0.25)
+                board.rfid.remove()
+            elif cmd[0] == 'motion' and board.pir:
+                board.pir.trigger(int(cmd[1]) if len(cmd) > 1 else 2000)
+            elif cmd[0] == 'door' and board.door:
+                board.door.open() if cmd[1] == 'open' else board.door.close()
+            elif cmd[0] == 'quit':
+                break
+            else:
+                print("not available on", args.node, "-", line.strip())
+        except (IndexError, ValueError) as e:
+            print("bad command:", e)
+    board.stop()
+
+
+if __name__ == '__main__':
+    main()
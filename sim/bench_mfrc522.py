@@ -0,0 +1,170 @@
+import argparse, json, os, sys, time, tracemalloc   # driver micro-benchmarks
+
+from .board import Board, REPO_ROOT
+from .rc522 import Card
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'mfrc522.json')
+UID = 'A1745C3EB7'
+COUNTERS = ('bytes', 'cs_toggles', 'reg_reads', 'reg_writes', 'spi_calls')
+
+
+# ─── COUNTING BUS ───────────────────────────────────────────────────────────────
+class CountingDevice:
+    """
+    Sits between the simulated SPI bus and the RC522 emulator and counts what
+    the driver puts on the wire. spi_calls is one per spi.write()/spi.read(),
+    i.e. one freshly allocated buffer on the MicroPython heap.
+    """
+
+    def __init__(self, dev):
+        self.dev = dev
+        self.reset()
+
+    def reset(self):
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self._first = False
+
+    def select(self):
+        self.counts['cs_toggles'] += 1
+        self._first = True
+        self.dev.select()
+
+    def deselect(self):
+        self.dev.deselect()
+
+    def transfer(self, data):
+        c = self.counts
+        c['bytes'] += len(data)
+        c['spi_calls'] += 1
+        if self._first and data:               # address byte opens every register access
+            c['reg_reads' if data[0] & 0x80 else 'reg_writes'] += 1
+            self._first = False
+        return self.dev.transfer(data)
+
+
+# ─── OPERATIONS ────────────────────────────────────────────────────────────────
+def setup():
+    board = Board('Tool_Scanner', echo=False)
+    chip = board.rfid
+    chip.settle_ms = 0                         # bus counts only, no RF timing
+    bus = board.spi_devices[22] = CountingDevice(chip)
+    drv = board.load('mfrc522', os.path.join(REPO_ROOT, 'mfrc522.py')).MFRC522(5, 19, 21, 2, 22)
+    chip.present(UID)
+    return drv, chip, bus
+
+
+def operations(drv, chip):
+    """name -> (prepare, op, check). prepare puts the card in the state the op expects."""
+    card = chip.cards[UID]
+    ser = card.uid + [card.bcc]
+    key = [0xFF] * 6
+    block = list(range(16))
+
+    def state(s, present=True):
+        def prep():
+            chip.card = card if present else None
+            card.state = s
+            card.write_addr = None
+        return prep
+
+    ok = lambda r: r == drv.OK or (isinstance(r, tuple) and r[0] == drv.OK)
+    return {
+        'poll_empty': (state(Card.IDLE, present=False), lambda: drv.request(drv.REQIDL),
+                       lambda r: r[0] == drv.ERR),
+        'request':    (state(Card.IDLE), lambda: drv.request(drv.REQIDL), ok),
+        'anticoll':   (state(Card.READY), drv.anticoll, ok),
+        'select_tag': (state(Card.READY), lambda: drv.select_tag(ser), ok),
+        'auth':       (state(Card.ACTIVE), lambda: drv.auth(drv.AUTHENT1A, 8, key, ser), ok),
+        'read':       (state(Card.ACTIVE), lambda: drv.read(8), lambda r: r is not None),
+        'write':      (state(Card.ACTIVE), lambda: drv.write(8, block), ok),
+        '_crc':       (state(Card.ACTIVE), lambda: drv._crc(block), lambda r: len(r) == 2),
+        'init':       (state(Card.IDLE), drv.init, lambda r: True),
+    }
+
+
+def bench(iterations=200):
+    drv, chip, bus = setup()
+    results = {}
+    for name, (prepare, op, check) in operations(drv, chip).items():
+        prepare()
+        r = op()                               # warm-up doubles as a sanity check
+        if not check(r):
+            raise RuntimeError('{} failed against the emulator: {!r}'.format(name, r))
+
+        prepare()
+        bus.reset()
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        op()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        counts = dict(bus.counts)              # counters are deterministic: one run is exact
+
+        elapsed = 0.0
+        for _ in range(iterations):
+            prepare()
+            t = time.perf_counter()
+            op()
+            elapsed += time.perf_counter() - t
+
+        counts['peak_alloc_bytes'] = peak      # CPython heap, driver + emulator together
+        counts['bus_us_at_1mhz'] = counts['bytes'] * 8   # time on the wire at 1 MHz SCK
+        counts['wall_us'] = round(elapsed / iterations * 1e6, 2)
+        results[name] = counts
+    return results
+
+
+# ─── BASELINE COMPARISON ───────────────────────────────────────────────────────
+def compare(results, baseline, wall_tolerance=0.25):
+    """Return (lines, regressed). Counters must not grow; wall time may drift by the tolerance."""
+    lines, regressed = [], False
+    for name, now in results.items():
+        old = baseline.get(name)
+        if old is None:
+            lines.append('{:<11} new'.format(name))
+            continue
+        diffs = []
+        for key in COUNTERS + ('peak_alloc_bytes',):
+            if now[key] != old.get(key):
+                diffs.append('{} {}->{}'.format(key, old.get(key), now[key]))
+                regressed |= key in COUNTERS and now[key] > old.get(key, 0)
+        if old.get('wall_us') and now['wall_us'] > old['wall_us'] * (1 + wall_tolerance):
+            diffs.append('wall_us {}->{}'.format(old['wall_us'], now['wall_us']))
+        lines.append('{:<11} {}'.format(name, ', '.join(diffs) if diffs else 'unchanged'))
+    return lines, regressed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim.bench_mfrc522',
+                                 description='Count SPI traffic and time for each MFRC522 driver call.')
+    ap.add_argument('-n', '--iterations', type=int, default=200)
+    ap.add_argument('--save', nargs='?', const=BASELINE, help='write results as the JSON baseline')
+    ap.add_argument('--compare', nargs='?', const=BASELINE, help='diff against a JSON baseline')
+    args = ap.parse_args(argv)
+
+    results = bench(args.iterations)
+    print('{:<11} {:>6} {:>4} {:>5} {:>6} {:>5} {:>8} {:>9}'.format(
+        'op', 'bytes', 'cs', 'reads', 'writes', 'calls', 'peak_B', 'wall_us'))
+    for name, r in results.items():
+        print('{:<11} {:>6} {:>4} {:>5} {:>6} {:>5} {:>8} {:>9}'.format(
+            name, r['bytes'], r['cs_toggles'], r['reg_reads'], r['reg_writes'], r['spi_calls'],
+            r['peak_alloc_bytes'], r['wall_us']))
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            lines, regressed = compare(results, json.load(f))
+        print('\nvs', args.compare)
+        print('\n'.join(lines))
+        status = 1 if regressed else 0
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('saved', args.save)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
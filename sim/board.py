@@ -0,0 +1,291 @@
+import ast, builtins, io, os, sys, tempfile, threading, types, traceback   # host-side plumbing
+
+from .clock import Clock, Halt
+from .hardware import Pin, PWM, SPI, Timer, PIR, DoorSwitch, Servo
+from .netstack import network_module, ntptime_module, thread_module, ujson_module, socket_module
+from .rc522 import RC522
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ─── NODE PROFILES ──────────────────────────────────────────────────────────────
+# which virtual peripherals each main.py expects, keyed by node directory
+PROFILES = {
+    'ID_Scanner_Servo': {'rc522_cs': 22, 'door_pin': 36},
+    'Tool_Scanner':     {'rc522_cs': 22},
+    'IR_Buzzer_Host':   {'pir_pin': 36},
+}
+
+
+# ─── BOARD ─────────────────────────────────────────────────────────────────────
+class Board:
+    """
+    One simulated ESP32. Holds pin levels, attached peripherals, a private
+    filesystem directory and the module table that the node's main.py sees
+    in place of `machine`, `esp32`, `network`, `ntptime`, `_thread`, `socket`, `time`.
+
+    - node: directory name under the repo root (e.g. 'Tool_Scanner')
+    - clock: shared Clock; several boards on one clock replay in lockstep
+    - fs_root: directory standing in for the ESP32 flash (temp dir if None)
+    - ports: {device port: host port}; unmapped ports bind an ephemeral port
+    """
+
+    def __init__(self, node, clock=None, fs_root=None, ip='127.0.0.1', ports=None,
+                 bind_host='127.0.0.1', echo=True):
+        self.node = node
+        self.node_dir = os.path.join(REPO_ROOT, node)
+        self.clock = clock or Clock()
+        self.fs_root = fs_root or tempfile.mkdtemp(prefix=node + '-')
+        os.makedirs(self.fs_root, exist_ok=True)
+        self.ip = ip
+        self.bind_host = bind_host
+        self.port_map = dict(ports or {})
+        self.ports = {}                        # device port -> bound host port
+        self.echo = echo
+
+        self.pin_levels, self.pin_modes, self.pin_irqs = {}, {}, {}
+        self.pin_reads = {}                    # pin -> number of value() reads (loop-rate probe)
+        self.spi_devices = {}                  # CS pin -> device
+        self.trace = []                        # (virtual ms, kind, args)
+        self.listeners = []                    # callables(ms, kind, args)
+        self.errors = []
+        self.threads = []
+        self.globals = None                    # main.py namespace once running
+        self.started = threading.Event()
+        self._lock = threading.Lock()
+        self._ports_changed = threading.Condition(self._lock)
+        self.ext0 = None                       # (pin, level) armed by esp32.wake_on_ext0
+        self.wake_reason = 0                   # machine.wake_reason() after the last sleep
+        self.slept_ms = 0.0                    # virtual ms spent in machine.lightsleep
+        self._wakeup = threading.Event()
+
+        profile = PROFILES.get(node, {})
+        self.rfid = self.pir = self.door = None
+        if 'rc522_cs' in profile:
+            self.rfid = RC522(self.clock)
+            self.spi_devices[profile['rc522_cs']] = self.rfid
+            self.pin_levels[profile['rc522_cs']] = 1
+        if 'pir_pin' in profile:
+            self.pir = PIR(self, profile['pir_pin'])
+        if 'door_pin' in profile:
+            self.door = DoorSwitch(self, profile['door_pin'])
+
+        self.modules = {}
+        self.builtins = dict(vars(builtins))
+        self.builtins.update(__import__=self._import, open=self._open, print=self._print)
+        self._factories = {
+            'machine':  self._machine_module,
+            'network':  lambda: network_module(self),
+            'ntptime':  lambda: ntptime_module(self),
+            '_thread':  lambda: thread_module(self),
+            'ujson':    lambda: ujson_module(self),
+            'socket':   lambda: socket_module(self),
+            'usocket':  lambda: socket_module(self),
+            'time':     self.clock.module,
+            'utime':    self.clock.module,
+            'servo':    self._servo_module,
+            'esp32':    self._esp32_module,
+        }
+
+    # ── events / tracing ──
+    def record(self, kind, *args):
+        ms = self.clock.elapsed_ms()
+        with self._lock:
+            self.trace.append((ms, kind, args))
+        for fn in self.listeners:
+            fn(ms, kind, args)
+
+    def set_pin(self, pin, level):
+        old = self.pin_levels.get(pin, 0)
+        self.pin_levels[pin] = level
+        dev = self.spi_devices.get(pin)
+        if dev is not None and old != level:
+            dev.select() if level == 0 else dev.deselect()
+        if self.ext0 and self.ext0[0] == pin and level == self.ext0[1]:
+            self._wakeup.set()                 # ext0 wakes a light-sleeping CPU
+        irq = self.pin_irqs.get(pin)
+        if irq and irq[0] and old != level:
+            edge = Pin.IRQ_RISING if level else Pin.IRQ_FALLING
+            if irq[1] & edge:
+                irq[0](irq[2])                 # MicroPython passes the Pin to the handler
+
+    # ── networking ──
+    def host_port(self, port):
+        return self.port_map.get(port, 0)
+
+    def bound(self, port, host_port):
+        with self._ports_changed:
+            self.ports[port] = host_port
+            self._ports_changed.notify_all()
+
+    def wait_port(self, port=80, timeout=5):
+        """Block until main.py has bound `port`; returns the host port."""
+        with self._ports_changed:
+            self._ports_changed.wait_for(lambda: port in self.ports, timeout)
+        return self.ports.get(port)
+
+    # ── module table ──
+    def _machine_module(self):
+        mod = types.ModuleType('machine')
+        for cls in (Pin, PWM, SPI, Timer):
+            setattr(mod, cls.__name__, type(cls.__name__, (cls,), {'_board': self}))
+        mod.freq = lambda hz=None: 240_000_000
+        mod.reset = lambda: self.record('machine', 'reset')
+        mod.unique_id = lambda: bytes([0xE5, 0x32, 0x00, 0x00, len(self.node), 0x01])
+        mod.PIN_WAKE, mod.EXT1_WAKE, mod.TIMER_WAKE = 2, 3, 4   # ESP32 port values
+        mod.lightsleep = self.lightsleep
+        mod.wake_reason = lambda: self.wake_reason
+        return mod
+
+    def _esp32_module(self):
+        mod = types.ModuleType('esp32')
+        mod.WAKEUP_ALL_LOW, mod.WAKEUP_ANY_HIGH = False, True
+
+        def wake_on_ext0(pin, level):
+            self.ext0 = (getattr(pin, 'id', pin), 1 if level else 0)
+            self.record('esp32', 'wake_on_ext0', self.ext0)
+
+        mod.wake_on_ext0 = wake_on_ext0
+        return mod
+
+    # ── power ──
+    def lightsleep(self, ms=None):
+        """
+        machine.lightsleep: block the calling thread until `ms` virtual ms
+        pass or the ext0 pin reaches its level. Other node threads keep
+        running, unlike on the chip, so web/uplink stalls are not modelled.
+        """
+        t0 = self.clock.elapsed_ms()
+        self.record('sleep', ms)
+        self._wakeup.clear()
+        if self.ext0 and self.pin_levels.get(self.ext0[0], 0) == self.ext0[1]:
+            self._wakeup.set()                 # level already present: no sleep at all
+        deadline = None if ms is None else t0 + ms
+        while not self._wakeup.is_set():
+            self.clock.check()
+            left = 50 if deadline is None else min(50, deadline - self.clock.elapsed_ms())
+            if left <= 0:
+                break
+            self._wakeup.wait(left / 1000 / self.clock.speed)
+        self.wake_reason = 2 if self._wakeup.is_set() else 4
+        self.slept_ms += self.clock.elapsed_ms() - t0
+        self.record('wake', self.wake_reason)
+
+    def _servo_module(self):
+        path = os.path.join(self.node_dir, 'servo.py')
+        if os.path.exists(path):               # prefer a real servo.py if one is added
+            return self.load('servo', path)
+        mod = types.ModuleType('servo')
+        mod.Servo = type('Servo', (Servo,), {'_board': self})
+        return mod
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in self.modules:
+            return self.modules[name]
+        if level == 0 and name in self._factories:
+            mod = self.modules[name] = self._factories[name]()
+            return mod
+        if level == 0:
+            for base in (self.node_dir, os.path.join(REPO_ROOT, 'lib'), REPO_ROOT):
+                path = os.path.join(base, name + '.py')
+                if os.path.exists(path):
+                    return self.load(name, path)
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    def load(self, name, path):
+        """Execute a device-side module against this board's stand-ins."""
+        mod = types.ModuleType(name)
+        mod.__file__ = path
+        mod.__builtins__ = self.builtins
+        self.modules[name] = mod
+        with open(path) as f:
+            exec(compile(f.read(), path, 'exec'), mod.__dict__)
+        return mod
+
+    # ── filesystem / console ──
+    def path(self, name):
+        return name if os.path.isabs(name) else os.path.join(self.fs_root, name)
+
+    def _open(self, file, mode='r', *args, **kw):
+        f = open(self.path(file), mode, *args, **kw)
+        if any(c in mode for c in 'wa+'):
+            return _TracedFile(self, file, f)
+        return f
+
+    def _print(self, *args, sep=' ', end='\n', file=None, flush=False):
+        buf = io.StringIO()
+        print(*args, sep=sep, end=end, file=buf)
+        text = buf.getvalue()
+        self.record('print', text)
+        if self.echo:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    # ── lifecycle ──
+    def spawn(self, fn, args=(), kwargs=None):
+        def run():
+            try:
+                fn(*args, **(kwargs or {}))
+            except Halt:
+                pass
+            except Exception as e:
+                self.errors.append(e)
+                traceback.print_exc()
+        t = threading.Thread(target=run, name='{}:{}'.format(self.node, getattr(fn, '__name__', 'fn')),
+                             daemon=True)
+        self.threads.append(t)
+        t.start()
+        return t.ident
+
+    def start(self, config=None):
+        """
+        Run the node's main.py, as __main__, in a background thread.
+        config: {NAME: value} replacing top-level USER CONFIG assignments
+        (e.g. {'PEER_PORT': 9998}) without editing the file.
+        """
+        path = os.path.join(self.node_dir, 'main.py')
+        self.globals = {'__name__': '__main__', '__file__': path, '__builtins__': self.builtins}
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+        for node in tree.body:
+            if (config and isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and getattr(node.targets[0], 'id', None) in config):
+                node.value = ast.parse(repr(config[node.targets[0].id]), mode='eval').body
+        code = compile(tree, path, 'exec')
+
+        def main():
+            self.started.set()
+            exec(code, self.globals)
+
+        self.spawn(main)
+        self.started.wait()
+        return self
+
+    def stop(self, timeout=2):
+        self.clock.stop()
+        for t in self.threads:
+            t.join(timeout)
+
+
+class _TracedFile:
+    """File wrapper that reports every write so log rows can be timed and checked."""
+
+    def __init__(self, board, name, f):
+        self._board, self._name, self._f = board, name, f
+
+    def write(self, s):
+        n = self._f.write(s)
+        self._f.flush()
+        self._board.record('write', self._name, s)
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __iter__(self):
+        return iter(self._f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
@@ -0,0 +1,92 @@
+import calendar, threading, time as _time   # real clock underneath the virtual one
+
+# ─── VIRTUAL CLOCK ──────────────────────────────────────────────────────────────
+class Halt(BaseException):
+    """Raised inside a node thread to unwind it when the simulation stops."""
+
+
+class Clock:
+    """
+    Shared virtual clock for every simulated board.
+
+    - start: UTC epoch seconds the virtual clock reads at t=0
+    - speed: how many virtual seconds pass per real second
+    """
+
+    def __init__(self, start=None, speed=1.0):
+        self.start = _time.time() if start is None else start
+        self.speed = float(speed)
+        self._t0 = _time.perf_counter()        # real reference point
+        self.stopped = threading.Event()       # set once to halt every node
+
+    def now(self):
+        return self.start + (_time.perf_counter() - self._t0) * self.speed  # virtual epoch secs
+
+    def elapsed_ms(self):
+        return (_time.perf_counter() - self._t0) * self.speed * 1000  # virtual ms since start
+
+    def sleep(self, secs):
+        if self.stopped.wait(max(secs, 0) / self.speed):  # scaled real wait
+            raise Halt()
+
+    def sleep_until(self, elapsed_ms):
+        self.sleep((elapsed_ms - self.elapsed_ms()) / 1000)
+
+    def check(self):
+        if self.stopped.is_set():              # cheap halt point for busy loops
+            raise Halt()
+
+    def stop(self):
+        self.stopped.set()
+
+    def module(self):
+        """Build a MicroPython-flavoured `time` module bound to this clock."""
+        return TimeModule(self)
+
+
+class TimeModule:
+    """Stand-in for MicroPython's `time` (sleep_ms, ticks_ms, int time(), ...)."""
+
+    def __init__(self, clock):
+        self._clock = clock
+
+    def __getattr__(self, name):
+        return getattr(_time, name)            # anything we don't model comes from CPython
+
+    def time(self):
+        return int(self._clock.now())          # MicroPython returns whole seconds
+
+    def time_ns(self):
+        return int(self._clock.now() * 1e9)
+
+    def localtime(self, secs=None):
+        if secs is None:
+            secs = self._clock.now()
+        return tuple(_time.gmtime(int(secs))[:8])  # RTC runs on UTC after ntptime.settime()
+
+    gmtime = localtime
+
+    def mktime(self, tm):
+        return calendar.timegm(tuple(tm[:6]) + (0, 0, 0))
+
+    def sleep(self, secs):
+        self._clock.sleep(secs)
+
+    def sleep_ms(self, ms):
+        self._clock.sleep(ms / 1000)
+
+    def sleep_us(self, us):
+        self._clock.sleep(us / 1_000_000)
+
+    def ticks_ms(self):
+        return int(self._clock.elapsed_ms()) & 0x3FFFFFFF  # wraps like the ESP32 port
+
+    def ticks_us(self):
+        return int(self._clock.elapsed_ms() * 1000) & 0x3FFFFFFF
+
+    def ticks_add(self, ticks, delta):
+        return (ticks + delta) & 0x3FFFFFFF
+
+    def ticks_diff(self, new, old):
+        d = (new - old) & 0x3FFFFFFF
+        return d - 0x40000000 if d & 0x20000000 else d
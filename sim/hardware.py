@@ -0,0 +1,237 @@
+import threading, traceback   # pin levels are touched by node threads and the replay thread
+
+from .clock import Halt
+
+# ─── machine.Pin ────────────────────────────────────────────────────────────────
+class Pin:
+    """GPIO stand-in. Levels live on the board so virtual devices can drive inputs."""
+
+    IN, OUT, OPEN_DRAIN = 1, 3, 7
+    PULL_UP, PULL_DOWN = 1, 2
+    IRQ_FALLING, IRQ_RISING = 2, 1
+    WAKE_LOW, WAKE_HIGH = 4, 5
+
+    _board = None                              # bound per board by Board.machine_module()
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.board = self._board
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.board.pin_modes[self.id] = mode
+        if pull == self.PULL_UP:
+            self.board.pin_levels.setdefault(self.id, 1)
+        if value is not None:
+            self.value(value)
+
+    def value(self, v=None):
+        if v is None:
+            self.board.pin_reads[self.id] = self.board.pin_reads.get(self.id, 0) + 1
+            return self.board.pin_levels.get(self.id, 0)
+        self.board.set_pin(self.id, 1 if v else 0)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, wake=None):
+        self.board.pin_irqs[self.id] = (handler, trigger, self)
+
+    __call__ = value
+
+    def __repr__(self):
+        return "Pin({})".format(self.id)
+
+
+# ─── machine.PWM ────────────────────────────────────────────────────────────────
+class PWM:
+    """Records every frequency/duty change so buzzer and servo output can be checked."""
+
+    _board = None
+
+    def __init__(self, pin, freq=None, duty=None, duty_u16=None):
+        self.board = self._board
+        self.pin = pin.id if isinstance(pin, Pin) else pin
+        self._freq, self._duty = freq or 5000, duty or 512
+        self.board.record('pwm', self.pin, 'init')
+        if freq is not None:
+            self.freq(freq)
+        if duty is not None:
+            self.duty(duty)
+
+    def freq(self, f=None):
+        if f is None:
+            return self._freq
+        self._freq = f
+        self.board.record('pwm', self.pin, 'freq', f)
+
+    def duty(self, d=None):
+        if d is None:
+            return self._duty
+        self._duty = d
+        self.board.record('pwm', self.pin, 'duty', d)
+
+    def duty_u16(self, d=None):
+        if d is None:
+            return self._duty << 6
+        self.duty(d >> 6)
+
+    def deinit(self):
+        self.board.record('pwm', self.pin, 'deinit')
+
+
+# ─── machine.SPI ────────────────────────────────────────────────────────────────
+class SPI:
+    """
+    SPI master that routes bytes to whichever attached device has its CS pin low.
+    Devices implement select(), deselect() and transfer(bytes) -> list.
+    """
+
+    _board = None
+    MSB, LSB = 0, 1
+
+    def __init__(self, id, baudrate=1000000, polarity=0, phase=0, bits=8,
+                 firstbit=MSB, sck=None, mosi=None, miso=None):
+        self.id = id
+        self.board = self._board
+        self.baudrate = baudrate
+
+    def init(self, baudrate=1000000, **kw):
+        self.baudrate = baudrate
+
+    def deinit(self):
+        pass
+
+    def _device(self):
+        for cs, dev in self.board.spi_devices.items():
+            if not self.board.pin_levels.get(cs, 1):
+                return dev
+        return None
+
+    def write(self, buf):
+        dev = self._device()
+        if dev is not None:
+            dev.transfer(bytes(buf))
+
+    def read(self, nbytes, write=0x00):
+        dev = self._device()
+        if dev is None:
+            return bytes([0xFF] * nbytes)      # floating MISO
+        return bytes(dev.transfer(bytes([write] * nbytes)))
+
+    def readinto(self, buf, write=0x00):
+        buf[:] = self.read(len(buf), write)
+
+    def write_readinto(self, wbuf, rbuf):
+        dev = self._device()
+        rbuf[:] = bytes(dev.transfer(bytes(wbuf))) if dev else bytes([0xFF] * len(wbuf))
+
+
+# ─── machine.Timer ──────────────────────────────────────────────────────────────
+class Timer:
+    """
+    ONE_SHOT / PERIODIC timer whose callback runs on a host thread after
+    `period` virtual ms. Re-init or deinit cancels a pending shot.
+    """
+
+    ONE_SHOT, PERIODIC = 0, 1
+    _board = None
+
+    def __init__(self, id=-1, **kw):
+        self.id = id
+        self.board = self._board
+        self._t, self._gen = None, 0
+        if kw:
+            self.init(**kw)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=-1):
+        self.deinit()
+        if freq > 0:
+            period = 1000 / freq
+        self.mode, self.period, self.callback = mode, period, callback
+        self.board.record('timer', self.id, mode, period)
+        self._arm()
+
+    def _arm(self):
+        t = threading.Timer(self.period / 1000 / self.board.clock.speed, self._fire, (self._gen,))
+        t.daemon = True
+        self._t = t
+        t.start()
+
+    def _fire(self, gen):
+        if gen != self._gen or self.board.clock.stopped.is_set():
+            return                             # cancelled, or the board is shutting down
+        if self.mode == self.PERIODIC:
+            self._arm()
+        try:
+            self.callback(self)
+        except Halt:
+            pass
+        except Exception as e:
+            self.board.errors.append(e)
+            traceback.print_exc()
+
+    def deinit(self):
+        self._gen += 1
+        if self._t:
+            self._t.cancel()
+            self._t = None
+
+
+# ─── VIRTUAL SENSORS / ACTUATORS ───────────────────────────────────────────────
+class PIR:
+    """HC-SR501 style PIR: output goes high for `hold_ms` after motion."""
+
+    def __init__(self, board, pin):
+        self.board, self.pin = board, pin
+        self._timer = None
+        board.set_pin(pin, 0)
+
+    def trigger(self, hold_ms=2000):
+        if self._timer:
+            self._timer.cancel()
+        self.board.set_pin(self.pin, 1)
+        self._timer = threading.Timer(hold_ms / 1000 / self.board.clock.speed, self.board.set_pin,
+                                      (self.pin, 0))
+        self._timer.daemon = True
+        self._timer.start()
+
+
+class DoorSwitch:
+    """Door-open switch on a pulled-down input: reads 1 while the door is open."""
+
+    def __init__(self, board, pin):
+        self.board, self.pin = board, pin
+        board.set_pin(pin, 0)
+
+    def open(self):
+        self.board.set_pin(self.pin, 1)
+
+    def close(self):
+        self.board.set_pin(self.pin, 0)
+
+    @property
+    def is_open(self):
+        return bool(self.board.pin_levels.get(self.pin, 0))
+
+
+class Servo:
+    """
+    Stand-in for the `servo` module ID_Scanner_Servo imports (not kept in this
+    repo). Records the commanded angle instead of driving a PWM.
+    """
+
+    _board = None
+
+    def __init__(self, pin):
+        self.board = self._board
+        self.pin = pin
+        self.angle = None
+
+    def move(self, angle):
+        self.angle = angle
+        self.board.record('servo', self.pin, angle)
@@ -0,0 +1,215 @@
+import argparse, json, random, socket, sys, threading, time   # HTTP load generator
+
+from .board import Board, PROFILES
+from .clock import Clock
+from .replay import percentile
+
+# default request mix per node: path -> weight (controls that wipe state are opt-in)
+MIXES = {
+    'ID_Scanner_Servo': {'/': 1, '/log.csv': 3},
+    'Tool_Scanner':     {'/': 1, '/log.csv': 3},
+    'IR_Buzzer_Host':   {'/': 1, '/status': 6, '/stop': 1},
+}
+PROBE_UID = {'ID_Scanner_Servo': 'DEADBEEF', 'Tool_Scanner': 'A1745C3EB7'}  # no door wait on ID
+
+
+# ─── LOG FIXTURES ───────────────────────────────────────────────────────────────
+def write_log(path, node, rows, seed=1):
+    """Fill `path` with `rows` realistic log lines in the node's own CSV layout."""
+    rnd = random.Random(seed)
+    tools = ['A1745C3EB7', '42455C3E65', '43975C3EB6', 'B56F5C3EB8', '72475C3E57']
+    users = ['8E8939033D', '1AB631039E', '17182D0220', '2BE9960256']
+    t = time.mktime((2025, 1, 6, 8, 0, 0, 0, 0, 0))
+    counts = {}
+    with open(path, 'w') as f:
+        if node == 'Tool_Scanner':
+            f.write("timestamp,uid,username,state\n")
+        else:
+            f.write("timestamp,uid,username\n")
+        for i in range(rows):
+            t += rnd.randint(5, 600)
+            ts = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))
+            if node == 'Tool_Scanner':
+                uid = rnd.choice(tools)
+                counts[uid] = counts.get(uid, 0) + 1
+                state = "Checked Out" if counts[uid] % 2 else "Checked In"
+                f.write("{},{},Tool {},{}\n".format(ts, uid, tools.index(uid) + 1, state))
+            else:
+                uid = rnd.choice(users)
+                f.write("{},{},User {}\n".format(ts, uid, users.index(uid) + 1))
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        path, _, w = part.partition('=')
+        mix[path if path.startswith('/') else '/' + path] = float(w or 1)
+    return mix
+
+
+# ─── CLIENT ────────────────────────────────────────────────────────────────────
+def fetch(host, port, path, timeout):
+    """One HTTP/1.0 GET read to EOF, the way a browser tab or scraper hits the node."""
+    s = socket.create_connection((host, port), timeout=timeout)
+    try:
+        s.sendall("GET {} HTTP/1.0\r\nHost: {}\r\n\r\n".format(path, host).encode())
+        n = 0
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            n += len(chunk)
+        if n == 0:
+            raise OSError('empty response')
+        return n
+    finally:
+        s.close()
+
+
+# ─── ONE CONCURRENCY LEVEL ─────────────────────────────────────────────────────
+def run_level(host, port, mix, concurrency, duration, timeout=10.0, board=None, seed=1):
+    paths, weights = list(mix), list(mix.values())
+    stop = threading.Event()
+    lock = threading.Lock()
+    lat, fails, nbytes = [], [0], [0]
+
+    def worker(i):
+        rnd = random.Random(seed * 1000 + i)
+        while not stop.is_set():
+            path = rnd.choices(paths, weights)[0]
+            t = time.perf_counter()
+            try:
+                n = fetch(host, port, path, timeout)
+            except OSError:
+                with lock:
+                    fails[0] += 1
+                continue
+            with lock:
+                lat.append((time.perf_counter() - t) * 1000)
+                nbytes[0] += n
+
+    probe = Probe(board) if board else None
+    loop0 = loop_counter(board)
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    if probe:
+        probe.run(duration)
+    else:
+        time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout)
+    elapsed = time.perf_counter() - t0
+
+    res = {'concurrency': concurrency, 'requests': len(lat), 'failed': fails[0],
+           'rps': round(len(lat) / elapsed, 1), 'mb_per_s': round(nbytes[0] / elapsed / 1e6, 2),
+           'p50_ms': _r(percentile(lat, 50)), 'p99_ms': _r(percentile(lat, 99))}
+    if board:
+        res['loop_hz'] = round((loop_counter(board) - loop0) / elapsed, 1)
+        res['event_p50_ms'] = _r(percentile(probe.latencies, 50))
+        res['event_max_ms'] = _r(max(probe.latencies) if probe.latencies else None)
+    return res
+
+
+def loop_counter(board):
+    """Main-loop passes so far: RC522 polls on scanners, PIR reads on IR_Buzzer_Host."""
+    if board is None:
+        return 0
+    if board.rfid:
+        return board.rfid.polls
+    return board.pin_reads.get(PROFILES[board.node]['pir_pin'], 0)
+
+
+class Probe:
+    """Injects a tap or motion every `period` s and times how long the node takes to react."""
+
+    def __init__(self, board, period=2.0):
+        self.board, self.period = board, period
+        self.latencies = []
+        self.done = threading.Event()
+        board.listeners.append(self._seen)
+
+    def _seen(self, ms, kind, args):
+        if (kind == 'write' and args[0] == 'log.csv') or \
+                (kind == 'print' and args[0].startswith('Motion at')):
+            self.done.set()
+
+    def run(self, duration):
+        end = time.perf_counter() + duration
+        while time.perf_counter() + self.period <= end:
+            self.done.clear()
+            t = time.perf_counter()
+            if self.board.rfid:
+                self.board.rfid.present(PROBE_UID[self.board.node])
+                time.sleep(0.25)
+                self.board.rfid.remove()
+            else:
+                self.board.pir.trigger(500)
+            if self.done.wait(5):
+                self.latencies.append((time.perf_counter() - t) * 1000)
+            time.sleep(max(0, t + self.period - time.perf_counter()))
+        time.sleep(max(0, end - time.perf_counter()))
+        self.board.listeners.remove(self._seen)
+
+
+def _r(v):
+    return None if v is None else round(v, 1)
+
+
+# ─── SWEEP ─────────────────────────────────────────────────────────────────────
+def sweep(node, levels, rows_list, duration, mix=None, external=None, timeout=10.0, out=print):
+    mix = mix or MIXES[node]
+    results = []
+    for rows in (rows_list if node in PROBE_UID and not external else [None]):
+        board = None
+        if external:
+            host, _, port = external.partition(':')
+            port = int(port or 80)
+        else:
+            board = Board(node, Clock(speed=1.0), echo=False)
+            if rows is not None:
+                write_log(board.path('log.csv'), node, rows)
+            board.start()
+            host, port = '127.0.0.1', board.wait_port(80, timeout=10)
+            if board.rfid is None:
+                time.sleep(0.5)                # IR main loop starts after its server thread
+            idle = loop_counter(board)
+            time.sleep(2)
+            out('{} rows={} idle loop_hz={:.1f}'.format(node, rows, (loop_counter(board) - idle) / 2))
+        for c in levels:
+            r = run_level(host, port, mix, c, duration, timeout, board)
+            r.update(node=node, rows=rows)
+            results.append(r)
+            out('  c={concurrency:<3} rps={rps:<7} p50={p50_ms}ms p99={p99_ms}ms failed={failed} '
+                'loop_hz={lh} event_p50={ep}ms'.format(lh=r.get('loop_hz'), ep=r.get('event_p50_ms'), **r))
+        if board:
+            board.stop()
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim.loadtest',
+                                 description='Load-test a node web server running on the simulator.')
+    ap.add_argument('node', choices=sorted(PROFILES))
+    ap.add_argument('-c', '--concurrency', default='1,2,4,8,16', help='comma list of client counts')
+    ap.add_argument('--rows', default='10000,100000,1000000', help='log.csv sizes for the scanner nodes')
+    ap.add_argument('-d', '--duration', type=float, default=10.0, help='seconds per concurrency level')
+    ap.add_argument('--mix', type=parse_mix, help="weights like '/=1,/status=4,/log.csv=1'")
+    ap.add_argument('--timeout', type=float, default=10.0, help='per-request timeout (s)')
+    ap.add_argument('--external', metavar='HOST[:PORT]', help='drive a real board instead of the simulator')
+    ap.add_argument('--json', help='write all results to this file')
+    args = ap.parse_args(argv)
+
+    levels = [int(c) for c in args.concurrency.split(',')]
+    rows = [int(r) for r in args.rows.split(',')]
+    results = sweep(args.node, levels, rows, args.duration, args.mix, args.external, args.timeout)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import json, socket as _socket, threading, types   # real sockets/threads underneath
+
+# ─── network.WLAN ───────────────────────────────────────────────────────────────
+class WLAN:
+    """Station interface that 'connects' instantly and reports the board's IP."""
+
+    _board = None
+
+    def __init__(self, interface=0):
+        self.board = self._board
+        self._active = False
+        self._connected = False
+        self._config = (self.board.ip, '255.255.255.0', '127.0.0.1', '127.0.0.1')
+
+    def active(self, on=None):
+        if on is None:
+            return self._active
+        self._active = bool(on)
+        self.board.record('wlan', 'active', self._active)
+
+    def connect(self, ssid=None, password=None):
+        self._connected = self._active
+        self.board.record('wlan', 'connect', ssid)
+
+    def disconnect(self):
+        self._connected = False
+
+    def isconnected(self):
+        return self._connected
+
+    def ifconfig(self, config=None):
+        if config is None:
+            return self._config
+        self._config = tuple(config)
+        self.board.ip = config[0]              # honour static IPs (IR_Buzzer_Host)
+
+    def config(self, *args, **kw):
+        return None
+
+
+def network_module(board):
+    mod = types.ModuleType('network')
+    mod.STA_IF, mod.AP_IF = 0, 1
+    mod.WLAN = type('WLAN', (WLAN,), {'_board': board})
+    return mod
+
+
+def ntptime_module(board):
+    mod = types.ModuleType('ntptime')
+    mod.host = 'pool.ntp.org'
+    mod.settime = lambda: board.record('ntp', 'settime')  # virtual clock is already UTC
+    mod.time = lambda: int(board.clock.now())
+    return mod
+
+
+# ─── _thread ───────────────────────────────────────────────────────────────────
+def thread_module(board):
+    mod = types.ModuleType('_thread')
+
+    def start_new_thread(fn, args, kwargs=None):
+        return board.spawn(fn, args, kwargs or {})
+
+    mod.start_new_thread = start_new_thread
+    mod.allocate_lock = threading.Lock
+    mod.get_ident = threading.get_ident
+    mod.stack_size = lambda size=0: 0
+    return mod
+
+
+def ujson_module(board):
+    mod = types.ModuleType('ujson')
+    mod.dumps = lambda obj: json.dumps(obj, separators=(',', ':'))
+    mod.loads = json.loads
+    mod.dump = json.dump
+    mod.load = json.load
+    return mod
+
+
+# ─── socket ────────────────────────────────────────────────────────────────────
+_LAN = {}                                      # device UDP port -> {host addr of each bound socket}
+_LAN_LOCK = threading.Lock()
+
+
+def _is_broadcast(host):
+    return host == '255.255.255.255' or host.endswith('.255')
+
+
+class Socket:
+    """
+    Wraps a CPython socket with MicroPython semantics: send() takes str,
+    binds to port 80 are remapped to the board's host port, and a blocking
+    accept() still notices when the simulation is stopped. UDP datagrams to
+    a broadcast address reach every simulated socket bound to that port.
+    """
+
+    def __init__(self, board, af=_socket.AF_INET, type=_socket.SOCK_STREAM, proto=0, sock=None):
+        self.board = board
+        self.sock = sock or _socket.socket(af, type, proto)
+        self._timeout = None
+        self._lan = None                       # (device port, host addr) while bound to UDP
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+    def setsockopt(self, level, opt, value):
+        self.sock.setsockopt(level, opt, value)
+
+    def bind(self, addr):
+        host = self.board.bind_host if addr[0] in ('0.0.0.0', '') else addr[0]
+        port = self.board.host_port(addr[1])
+        if self.sock.type == _socket.SOCK_STREAM:
+            self.sock.setsockopt(_socket.SOL_SOCKET, _socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.board.bound(addr[1], self.sock.getsockname()[1])
+        if self.sock.type == _socket.SOCK_DGRAM:
+            self._lan = (addr[1], self.sock.getsockname())
+            with _LAN_LOCK:
+                _LAN.setdefault(addr[1], set()).add(self._lan[1])
+
+    def settimeout(self, t):
+        self._timeout = t
+        self.sock.settimeout(None if t is None else t / self.board.clock.speed)
+
+    def setblocking(self, flag):
+        self.settimeout(None if flag else 0)
+
+    def accept(self):
+        if self._timeout is not None:
+            self.board.clock.check()
+            cl, addr = self.sock.accept()
+        else:
+            self.sock.settimeout(0.1)          # poll so a stopped board can unwind
+            while True:
+                self.board.clock.check()
+                try:
+                    cl, addr = self.sock.accept()
+                    break
+                except _socket.timeout:
+                    pass
+            self.sock.settimeout(None)
+        cl.settimeout(None)
+        return Socket(self.board, sock=cl), addr
+
+    def send(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        if self.sock.type != _socket.SOCK_STREAM:
+            return self.sock.send(data)
+        self.sock.sendall(data)                # MicroPython's blocking send writes it all
+        return len(data)
+
+    write = sendall = send
+
+    def sendto(self, data, addr):
+        if isinstance(data, str):
+            data = data.encode()
+        if _is_broadcast(addr[0]):
+            with _LAN_LOCK:
+                peers = list(_LAN.get(addr[1], ()))
+            for peer in peers:
+                self.sock.sendto(data, peer)
+            return len(data)
+        return self.sock.sendto(data, addr)
+
+    def recv(self, n):
+        return self.sock.recv(n)
+
+    def recvfrom(self, n):
+        return self.sock.recvfrom(n)
+
+    def close(self):
+        if self._lan:
+            with _LAN_LOCK:
+                _LAN.get(self._lan[0], set()).discard(self._lan[1])
+            self._lan = None
+        self.sock.close()
+
+
+def socket_module(board):
+    mod = types.ModuleType('socket')
+    for name in ('AF_INET', 'SOCK_STREAM', 'SOCK_DGRAM', 'SOL_SOCKET', 'SO_REUSEADDR',
+                 'SO_BROADCAST', 'IPPROTO_IP', 'IPPROTO_UDP', 'IP_ADD_MEMBERSHIP',
+                 'IP_MULTICAST_TTL', 'inet_aton', 'timeout', 'error'):
+        setattr(mod, name, getattr(_socket, name))
+
+    def socket(af=_socket.AF_INET, type=_socket.SOCK_STREAM, proto=0):
+        return Socket(board, af, type, proto)
+
+    def getaddrinfo(host, port, af=0, type=0, proto=0, flags=0):
+        return [(_socket.AF_INET, _socket.SOCK_STREAM, 0, '', (host, port))]  # port remapped at bind
+
+    mod.socket = socket
+    mod.getaddrinfo = getaddrinfo
+    return mod
@@ -0,0 +1,151 @@
+import argparse, calendar, json, os, random, sys, threading, time   # peer messaging latency
+
+from .board import Board, REPO_ROOT
+from .clock import Clock
+from .replay import percentile
+
+PORT = 9998                                    # device-side peer port (remapped per board)
+AUTH_UID = '8E8939033D'                        # "User 1" on ID_Scanner_Servo
+
+
+def _stats(ms):
+    if not ms:
+        return {'n': 0}
+    return {'n': len(ms), 'p50_ms': round(percentile(ms, 50), 2), 'p99_ms': round(percentile(ms, 99), 2),
+            'max_ms': round(max(ms), 2)}
+
+
+# ─── DELIVERY ───────────────────────────────────────────────────────────────────
+def delivery(count=200, interval_ms=20, loss=0.0, seed=1):
+    """
+    Publish `count` events from one simulated node to another over local UDP
+    and time publish() -> handler. `loss` drops that share of datagrams on
+    the wire, first copies and repeats alike, to exercise the retry window.
+    """
+    clock = Clock(speed=1.0)
+    path = os.path.join(REPO_ROOT, 'peerlink.py')
+    pub_board, sub_board = Board('IR_Buzzer_Host', clock, echo=False), Board('Tool_Scanner', clock, echo=False)
+    pub = pub_board.load('peerlink', path).PeerLink(PORT, 'ir')
+    sub = sub_board.load('peerlink', path).PeerLink(PORT, 'tool')
+    sent, got, calls = {}, {}, [0]
+
+    def handler(value, node):
+        calls[0] += 1
+        got.setdefault(value, time.perf_counter())
+
+    sub.on('ping', handler)
+    sub.start()
+    pub.start()
+    rnd = random.Random(seed)
+    wire = pub.sock.sendto
+    pub.sock.sendto = lambda data, addr: len(data) if rnd.random() < loss else wire(data, addr)
+
+    for i in range(count):
+        sent[i] = time.perf_counter()
+        pub.publish('ping', i)
+        time.sleep(interval_ms / 1000)
+    time.sleep(0.5)                            # let the last retry window close
+    clock.stop()
+    pub_board.stop(); sub_board.stop()
+
+    lat = [(got[i] - sent[i]) * 1000 for i in sent if i in got]
+    return dict(_stats(lat), sent=count, delivered=len(got), lost=count - len(got),
+                duplicate_calls=calls[0] - len(got), loss=loss)
+
+
+# ─── END TO END ─────────────────────────────────────────────────────────────────
+def _wait(cond, timeout=5.0):
+    t0 = time.perf_counter()
+    while not cond():
+        if time.perf_counter() - t0 > timeout:
+            return None
+        time.sleep(0.001)
+    return (time.perf_counter() - t0) * 1000
+
+
+def end_to_end(runs=5, presence_ms=1500, echo=False, seed=1):
+    """
+    Run all three main.py files with PEER_PORT set, after hours (03:00 at the
+    IR host). Each run triggers the PIR and times until both scanners turn
+    their antenna back on, then taps an authorized card on ID_Scanner_Servo
+    and times until IR_Buzzer_Host silences the alarm the motion raised.
+    The tap lands at a random phase of the ID scanner's 200 ms poll loop.
+    """
+    day = time.gmtime()
+    start = calendar.timegm((day[0], day[1], day[2], 10, 0, 0))  # 03:00 at UTC-7
+    clock = Clock(start=start, speed=1.0)
+    config = {'PEER_PORT': PORT, 'PRESENCE_MS': presence_ms}
+    ir, tool, door = (Board(n, clock, echo=echo).start(config)
+                      for n in ('IR_Buzzer_Host', 'Tool_Scanner', 'ID_Scanner_Servo'))
+    for b in (ir, tool, door):
+        b.wait_port(80, timeout=10)
+
+    silenced = threading.Event()
+    ir.listeners.append(lambda ms, kind, args: kind == 'print' and args[0].startswith('Alarm silenced')
+                        and silenced.set())
+    gated = lambda: not tool.rfid.antenna and not door.rfid.antenna
+    result = {'reader_on_ms': [], 'silence_ms': [], 'failures': 0}
+    rnd = random.Random(seed)
+    ir.pir.trigger(100)                        # scanners poll until they first hear the IR host
+    _wait(lambda: ir.globals.get('alarm_active'), 2)
+    ir.globals['alarm_active'] = False         # same as GET /stop for the warm-up alarm
+    ir.globals['buzz'].cancel_flag = True
+    _wait(gated, presence_ms / 1000 + 5)
+
+    for _ in range(runs):
+        ir.globals['last_auth'] = None         # every run is a fresh intrusion
+        silenced.clear()
+        ir.pir.trigger(500)
+        on = _wait(lambda: tool.rfid.antenna and door.rfid.antenna)
+        if on is None:
+            result['failures'] += 1
+            continue
+        result['reader_on_ms'].append(on)
+        _wait(lambda: ir.globals.get('alarm_active'), 1)
+        time.sleep(rnd.random() * 0.2)         # otherwise every tap hits the same poll phase
+        door.rfid.present(AUTH_UID)
+        quiet = _wait(silenced.is_set)
+        door.rfid.remove()
+        if quiet is None:
+            result['failures'] += 1
+        else:
+            result['silence_ms'].append(quiet)
+        _wait(gated, presence_ms / 1000 + 5)   # presence expires before the next run
+
+    clock.stop()
+    for b in (ir, tool, door):
+        b.stop()
+    result['reader_on_ms'] = _stats(result['reader_on_ms'])
+    result['silence_ms'] = _stats(result['silence_ms'])
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim.peerlat',
+                                 description='Latency of PeerLink motion/unlock messages between simulated nodes.')
+    ap.add_argument('--count', type=int, default=200, help='events for the delivery test')
+    ap.add_argument('--loss', default='0,0.2', help='comma list of datagram loss rates to test')
+    ap.add_argument('--runs', type=int, default=5, help='motion + unlock rounds with all three nodes (0 skips)')
+    ap.add_argument('--echo', action='store_true', help='show node console output')
+    ap.add_argument('--json', help='write all results to this file')
+    args = ap.parse_args(argv)
+
+    results = {'delivery': []}
+    for loss in (float(x) for x in args.loss.split(',')):
+        r = delivery(args.count, loss=loss)
+        results['delivery'].append(r)
+        print("delivery loss={loss:.0%}: {delivered}/{sent} delivered, p50 {p50_ms} ms, p99 {p99_ms} ms, "
+              "max {max_ms} ms, duplicate handler calls {duplicate_calls}".format(**r))
+    if args.runs:
+        r = results['end_to_end'] = end_to_end(args.runs, echo=args.echo)
+        print("motion -> both readers on: {}".format(r['reader_on_ms']))
+        print("card unlock -> alarm silenced: {}".format(r['silence_ms']))
+        print("failed rounds: {}".format(r['failures']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
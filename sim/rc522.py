@@ -0,0 +1,278 @@
+import threading   # card presence changes arrive from the replay thread
+
+# ─── REGISTER MAP (subset the driver touches) ──────────────────────────────────
+COMMAND    = 0x01
+COMIEN     = 0x02
+COMIRQ     = 0x04
+DIVIRQ     = 0x05
+ERROR      = 0x06
+STATUS2    = 0x08
+FIFODATA   = 0x09
+FIFOLEVEL  = 0x0A
+CONTROL    = 0x0C
+BITFRAMING = 0x0D
+TXCONTROL  = 0x14
+CRCRESULTH = 0x21
+CRCRESULTL = 0x22
+
+# commands written to CommandReg
+CMD_IDLE      = 0x00
+CMD_CALCCRC   = 0x03
+CMD_TRANSCEIVE = 0x0C
+CMD_MFAUTHENT = 0x0E
+CMD_SOFTRESET = 0x0F
+
+DEFAULT_KEY = [0xFF] * 6
+
+
+def crc_a(data):
+    """ISO 14443-A CRC (preset 0x6363), returned low byte first as on the wire."""
+    crc = 0x6363
+    for b in data:
+        b ^= crc & 0xFF
+        b = (b ^ (b << 4)) & 0xFF
+        crc = ((crc >> 8) ^ (b << 8) ^ (b << 3) ^ (b >> 4)) & 0xFFFF
+    return [crc & 0xFF, crc >> 8]
+
+
+def parse_uid(uid):
+    """Accept 'A1745C3E' or 'A1745C3EB7' (UID + BCC) and return the 4 UID bytes."""
+    raw = bytes.fromhex(uid)
+    if len(raw) == 5 and raw[4] != (raw[0] ^ raw[1] ^ raw[2] ^ raw[3]):
+        raise ValueError("bad BCC in UID " + uid)
+    if len(raw) not in (4, 5):
+        raise ValueError("expected a 4-byte UID, got " + uid)
+    return list(raw[:4])
+
+
+# ─── CARD MODEL ────────────────────────────────────────────────────────────────
+class Card:
+    """A MIFARE Classic 1K tag: 4-byte UID, 64 blocks of 16 bytes, ISO 14443-3 states."""
+
+    IDLE, READY, ACTIVE = range(3)
+
+    def __init__(self, uid, key=None):
+        self.uid = parse_uid(uid) if isinstance(uid, str) else list(uid)
+        self.bcc = self.uid[0] ^ self.uid[1] ^ self.uid[2] ^ self.uid[3]
+        self.key = list(key or DEFAULT_KEY)
+        self.blocks = [[0] * 16 for _ in range(64)]
+        self.blocks[0] = self.uid + [self.bcc, 0x08, 0x04, 0x00] + [0] * 8  # manufacturer block
+        self.state = self.IDLE
+        self.write_addr = None                 # pending second half of a WRITE
+
+    def respond(self, frame, bits):
+        """Return (reply bytes, reply bits) or None for no answer (RF timeout)."""
+        if bits == 7 and frame == [0x26]:      # REQA: only IDLE cards answer
+            if self.state != self.IDLE:
+                self.state = self.IDLE         # unexpected REQA drops a READY card
+                return None
+            self.state = self.READY
+            return [0x04, 0x00], 16            # ATQA for a 4-byte UID
+        if bits == 7 and frame == [0x52]:      # WUPA wakes any state
+            self.state = self.READY
+            return [0x04, 0x00], 16
+        if self.state == self.IDLE:
+            return None
+        if frame[:2] == [0x93, 0x20]:          # anticollision, full UID
+            return self.uid + [self.bcc], 40
+        if frame[:2] == [0x93, 0x70] and len(frame) == 9:  # SELECT
+            if frame[2:7] != self.uid + [self.bcc] or crc_a(frame[:7]) != frame[7:9]:
+                self.state = self.IDLE
+                return None
+            self.state = self.ACTIVE
+            return [0x08] + crc_a([0x08]), 24  # SAK for MIFARE 1K
+        if self.state != self.ACTIVE:
+            self.state = self.IDLE
+            return None
+        if self.write_addr is not None:        # second phase of WRITE carries the data
+            addr, self.write_addr = self.write_addr, None
+            if len(frame) != 18 or crc_a(frame[:16]) != frame[16:]:
+                return [0x01], 4               # NAK
+            self.blocks[addr] = frame[:16]
+            return [0x0A], 4
+        if len(frame) == 4 and crc_a(frame[:2]) != frame[2:]:
+            return [0x01], 4
+        if frame[0] == 0x30:                   # READ: 16 data bytes + CRC
+            data = list(self.blocks[frame[1] & 0x3F])
+            return data + crc_a(data), 144
+        if frame[0] == 0xA0:                   # WRITE: ACK, then wait for data
+            self.write_addr = frame[1] & 0x3F
+            return [0x0A], 4
+        if frame[0] == 0x50:                   # HLTA
+            self.state = self.IDLE
+            return None
+        return None
+
+
+# ─── CHIP EMULATOR ─────────────────────────────────────────────────────────────
+class RC522:
+    """
+    Register-level MFRC522 model that sits on a simulated SPI bus.
+    The bus hands it raw bytes between CS low/high edges, exactly as the
+    driver in mfrc522.py clocks them out.
+
+    With a clock, a tag needs `settle_ms` after the antenna comes on before
+    it answers (ISO 14443-3 allows up to 5 ms), so a REQA sent straight
+    after field-on goes unanswered as it would on hardware.
+    """
+
+    SETTLE_MS = 5                              # tag power-up after the field comes on
+
+    def __init__(self, clock=None):
+        self.lock = threading.Lock()
+        self.clock = clock
+        self.settle_ms = self.SETTLE_MS
+        self.card = None                       # card currently in the field
+        self.cards = {}                        # UID string -> Card (keeps memory across taps)
+        self.polls = 0                         # REQA frames seen (one per scanner loop pass)
+        self.early_polls = 0                   # REQA/WUPA ignored because the field just came on
+        self.field_at = None                   # virtual ms the antenna last came on
+        self.reset()
+
+    # ── field control (called by replay / tests) ──
+    def present(self, uid):
+        with self.lock:
+            card = self.cards.get(uid)
+            if card is None:
+                card = self.cards[uid] = Card(uid)
+            card.state = Card.IDLE             # entering the field powers the tag up
+            self.card = card
+
+    def remove(self):
+        with self.lock:
+            self.card = None
+
+    # ── chip state ──
+    def reset(self):
+        self.regs = [0] * 64
+        self.regs[COMMAND] = 0x20
+        self.regs[COMIEN] = 0x80
+        self.regs[TXCONTROL] = 0x80
+        self.regs[CONTROL] = 0x10
+        self.fifo = []
+        self.crypto = False
+        self._addr = None
+
+    @property
+    def antenna(self):
+        return bool(self.regs[TXCONTROL] & 0x03)
+
+    # ── SPI side ──
+    def select(self):
+        self._addr = None                      # CS fell: next byte is an address
+
+    def deselect(self):
+        self._addr = None
+
+    def transfer(self, data):
+        """Clock bytes in from the master; returns the bytes shifted out."""
+        out = []
+        for b in data:
+            if self._addr is None:
+                self._addr = b
+                out.append(0)
+            elif self._addr & 0x80:            # read: byte on MOSI is don't-care
+                out.append(self.read_reg((self._addr >> 1) & 0x3F))
+            else:
+                self.write_reg((self._addr >> 1) & 0x3F, b)
+                out.append(0)
+        return out
+
+    def read_reg(self, reg):
+        with self.lock:
+            if reg == FIFODATA:
+                return self.fifo.pop(0) if self.fifo else 0
+            if reg == FIFOLEVEL:
+                return len(self.fifo)
+            if reg == STATUS2:
+                return self.regs[STATUS2] | (0x08 if self.crypto else 0)
+            return self.regs[reg]
+
+    def write_reg(self, reg, val):
+        with self.lock:
+            if reg == FIFODATA:
+                if len(self.fifo) < 64:
+                    self.fifo.append(val)
+            elif reg == FIFOLEVEL:
+                if val & 0x80:
+                    self.fifo = []             # FlushBuffer
+            elif reg in (COMIRQ, DIVIRQ):      # Set1/Set2: bit7 picks set vs clear
+                if val & 0x80:
+                    self.regs[reg] |= val & 0x7F
+                else:
+                    self.regs[reg] &= ~val & 0x7F
+            elif reg == STATUS2:
+                self.crypto = bool(val & 0x08)
+                self.regs[STATUS2] = val & 0xF7
+            elif reg == COMMAND:
+                self._command(val & 0x0F)
+            elif reg == TXCONTROL:
+                if val & 0x03 and not self.regs[TXCONTROL] & 0x03:
+                    self._field_on()
+                self.regs[TXCONTROL] = val
+            elif reg == BITFRAMING:
+                self.regs[BITFRAMING] = val & 0x7F
+                if val & 0x80 and self.regs[COMMAND] & 0x0F == CMD_TRANSCEIVE:
+                    self._transceive()
+            else:
+                self.regs[reg] = val
+
+    def _field_on(self):
+        if self.clock is not None:
+            self.field_at = self.clock.elapsed_ms()
+        if self.card:
+            self.card.state = Card.IDLE        # tag lost power while the field was off
+
+    def _settling(self):
+        return (self.field_at is not None
+                and self.clock.elapsed_ms() - self.field_at < self.settle_ms)
+
+    def _command(self, cmd):
+        if cmd == CMD_SOFTRESET:
+            self.reset()
+            return
+        self.regs[COMMAND] = (self.regs[COMMAND] & 0xF0) | cmd
+        if cmd == CMD_CALCCRC:
+            lo, hi = crc_a(self.fifo)
+            self.fifo = []
+            self.regs[CRCRESULTL], self.regs[CRCRESULTH] = lo, hi
+            self.regs[DIVIRQ] |= 0x04          # CRCIRq
+            self.regs[COMMAND] &= 0xF0
+        elif cmd == CMD_MFAUTHENT:
+            self._authenticate()
+
+    def _finish(self, reply):
+        self.regs[ERROR] = 0
+        if reply is None:
+            self.regs[COMIRQ] |= 0x01          # TimerIRq: nothing answered
+            self.regs[CONTROL] &= 0xF8
+            return
+        data, bits = reply
+        self.fifo = list(data)
+        self.regs[CONTROL] = (self.regs[CONTROL] & 0xF8) | (bits % 8)
+        self.regs[COMIRQ] |= 0x30              # RxIRq | IdleIRq
+
+    def _transceive(self):
+        frame, self.fifo = self.fifo, []
+        tx_last = self.regs[BITFRAMING] & 0x07
+        bits = (len(frame) - 1) * 8 + tx_last if tx_last else len(frame) * 8
+        if frame == [0x26]:
+            self.polls += 1
+        card = self.card if self.antenna else None
+        if card and bits == 7 and frame in ([0x26], [0x52]) and self._settling():
+            self.early_polls += 1
+            card = None                        # tag still powering up: no ATQA
+        self._finish(card.respond(frame, bits) if card else None)
+
+    def _authenticate(self):
+        frame, self.fifo = self.fifo, []
+        card = self.card if self.antenna else None
+        self.regs[COMMAND] &= 0xF0
+        if (card and card.state == Card.ACTIVE and len(frame) == 12
+                and frame[2:8] == card.key and frame[8:12] == card.uid):
+            self.crypto = True
+            self.regs[COMIRQ] |= 0x10          # IdleIRq
+            self.regs[ERROR] = 0
+        else:
+            self.regs[ERROR] = 0x01            # ProtocolErr so the driver reports ERR
+            self.regs[COMIRQ] |= 0x11          # IdleIRq | TimerIRq
@@ -0,0 +1,207 @@
+import argparse, calendar, csv, heapq, json, random, sys, time   # trace replay CLI
+
+from .board import Board
+from .clock import Clock
+from .rc522 import parse_uid
+
+# trace node column -> node directory
+NODES = {'id': 'ID_Scanner_Servo', 'tool': 'Tool_Scanner', 'ir': 'IR_Buzzer_Host'}
+DEFAULT_HOLD = {'tap': 250, 'motion': 2000}
+
+
+# ─── TRACE FORMAT ───────────────────────────────────────────────────────────────
+# CSV, one event per row, times in ms from the start of the replay:
+#   t_ms,node,event,value,hold_ms
+#   1000,tool,tap,A1745C3EB7,250      card held on the Tool_Scanner reader
+#   4000,id,tap,8E8939033D,           card on the ID reader (default hold)
+#   4400,id,door,open,                door switch opens / closes
+#   9000,ir,motion,,1500              PIR high for 1.5 s
+def load_trace(path):
+    events = []
+    with (sys.stdin if path == '-' else open(path)) as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#') or row[0] == 't_ms':
+                continue
+            row += [''] * (5 - len(row))
+            t, node, event, value, hold = row[:5]
+            node = NODES.get(node, node)
+            hold = int(hold) if hold else DEFAULT_HOLD.get(event, 0)
+            events.append((float(t), node, event, value, hold))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def generate_trace(taps, seed=1, tool_uids=None, user_uids=None):
+    """Synthetic workload: tool taps, ID unlocks with a door cycle, PIR motion."""
+    rnd = random.Random(seed)
+    tool_uids = tool_uids or ['A1745C3EB7', '42455C3E65', '43975C3EB6', 'B56F5C3EB8', '00FE5B3E9B']
+    user_uids = user_uids or ['8E8939033D', '1AB631039E', '17182D0220']
+    rows, t_tool, t_id, t_ir = [], 500, 700, 300
+    for i in range(taps):
+        rows.append((t_tool, 'tool', 'tap', rnd.choice(tool_uids + ['DEADBEEF']), 250))
+        t_tool += rnd.randint(1200, 2500)      # node blinks 500 ms + polls every 200 ms
+        if i % 3 == 0:
+            rows.append((t_id, 'id', 'tap', rnd.choice(user_uids), 250))
+            rows.append((t_id + 400, 'id', 'door', 'open', ''))
+            rows.append((t_id + 400 + rnd.randint(500, 3000), 'id', 'door', 'close', ''))
+            t_id += 6000
+        if i % 4 == 0:
+            rows.append((t_ir, 'ir', 'motion', '', rnd.randint(500, 1500)))
+            t_ir += rnd.randint(2500, 6000)
+    rows.sort(key=lambda r: r[0])
+    out = ['t_ms,node,event,value,hold_ms']
+    out += ['{},{},{},{},{}'.format(*r) for r in rows]
+    return '\n'.join(out) + '\n'
+
+
+# ─── EXPECTED LOGS ─────────────────────────────────────────────────────────────
+def expected_rows(board, taps):
+    """What log.csv should gain for the taps we injected, using the node's own tables."""
+    users = board.globals.get('AUTHORIZED_USERS', {})
+    rows, counts = [], {}
+    for uid in taps:
+        raw = parse_uid(uid)
+        uid = ''.join('{:02X}'.format(b) for b in raw + [raw[0] ^ raw[1] ^ raw[2] ^ raw[3]])  # as the node prints it
+        if board.node == 'Tool_Scanner':
+            counts[uid] = counts.get(uid, 0) + 1
+            state = 'Checked Out' if counts[uid] % 2 else 'Checked In'
+            rows.append([uid, users.get(uid, 'Unrecognized Tool'), state])
+        else:
+            rows.append([uid, users.get(uid, 'Unauthorized')])
+    return rows
+
+
+def logged_rows(board):
+    try:
+        with open(board.path('log.csv')) as f:
+            return [line.strip().split(',')[1:] for line in list(f)[1:] if line.strip()]
+    except OSError:
+        return []
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+# ─── REPLAY ────────────────────────────────────────────────────────────────────
+def replay(events, speed=20.0, start=None, drain_ms=3000, echo=False):
+    clock = Clock(start=start, speed=speed)
+    boards = {}
+    for node in sorted({e[1] for e in events}):
+        boards[node] = Board(node, clock, echo=echo).start()
+    for b in boards.values():
+        b.wait_port(80, timeout=10)            # main.py is up once its server bound
+
+    # scheduler: (virtual ms, seq, action, args)
+    t0 = clock.elapsed_ms()
+    queue, injected = [], {n: [] for n in boards}
+    seq = 0
+    for t, node, event, value, hold in events:
+        board = boards[node]
+        if event == 'tap':
+            heapq.heappush(queue, (t, seq, board.rfid.present, (value,))); seq += 1
+            heapq.heappush(queue, (t + hold, seq, board.rfid.remove, ())); seq += 1
+            injected[node].append(('tap', t, value))
+        elif event == 'motion':
+            heapq.heappush(queue, (t, seq, board.pir.trigger, (hold,))); seq += 1
+            injected[node].append(('motion', t, value))
+        elif event == 'door':
+            heapq.heappush(queue, (t, seq, board.door.open if value == 'open' else board.door.close, ()))
+            seq += 1
+        else:
+            raise ValueError('unknown trace event ' + event)
+
+    wall0 = time.perf_counter()
+    while queue:
+        t, _, fn, args = heapq.heappop(queue)
+        clock.sleep_until(t0 + t)
+        fn(*args)
+    clock.sleep_until(clock.elapsed_ms() + drain_ms)  # let the last taps land in the logs
+    wall = time.perf_counter() - wall0
+    late_ms = clock.elapsed_ms() - t0
+    for b in boards.values():
+        b.stop()
+
+    report = {'speed': speed, 'wall_s': round(wall, 3), 'virtual_s': round(late_ms / 1000, 3),
+              'nodes': {}}
+    for node, board in boards.items():
+        report['nodes'][node] = node_report(board, injected[node], t0, wall)
+    return report
+
+
+def node_report(board, injected, t0, wall):
+    taps = [(t0 + t, v) for kind, t, v in injected if kind == 'tap']
+    motions = [t0 + t for kind, t, v in injected if kind == 'motion']
+    writes = [(ms, args[1]) for ms, kind, args in board.trace
+              if kind == 'write' and args[0] == 'log.csv' and args[1].count(',') >= 2]
+    prints = [ms for ms, kind, args in board.trace
+              if kind == 'print' and args[0].startswith('Motion at')]
+
+    latencies = []
+    w = 0
+    for t, uid in taps:                        # pair each tap with the next log row for it
+        while w < len(writes) and (writes[w][0] < t or uid.upper() not in writes[w][1]):
+            w += 1
+        if w < len(writes):
+            latencies.append(writes[w][0] - t)
+            w += 1
+    p = 0
+    for t in motions:
+        while p < len(prints) and prints[p] < t:
+            p += 1
+        if p < len(prints):
+            latencies.append(prints[p] - t)
+            p += 1
+
+    rep = {'events': len(taps) + len(motions), 'handled': len(latencies),
+           'throughput_per_s': round(len(latencies) / wall, 2) if wall else None,
+           'latency_ms': {'p50': _r(percentile(latencies, 50)), 'p95': _r(percentile(latencies, 95)),
+                          'max': _r(max(latencies) if latencies else None)},
+           'errors': [repr(e) for e in board.errors]}
+    if taps:
+        want, got = expected_rows(board, [uid for _, uid in taps]), logged_rows(board)
+        bad = [i for i, (a, b) in enumerate(zip(want, got)) if a != b]
+        rep['log'] = {'expected': len(want), 'logged': len(got), 'mismatched': len(bad),
+                      'ok': not bad and len(want) == len(got)}
+    if motions:
+        rep['log'] = {'expected': len(motions), 'logged': len(prints),
+                      'ok': len(prints) == len(motions)}
+    return rep
+
+
+def _r(v):
+    return None if v is None else round(v, 1)
+
+
+def parse_start(text):
+    return calendar.timegm(time.strptime(text, '%Y-%m-%dT%H:%M:%S'))
+
+
+# ─── CLI ───────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim.replay',
+                                 description='Replay tap/motion/door traces against simulated nodes.')
+    ap.add_argument('trace', nargs='?', help="trace CSV ('-' for stdin)")
+    ap.add_argument('--speed', type=float, default=20.0, help='virtual seconds per real second')
+    ap.add_argument('--start', type=parse_start, help='virtual UTC start, e.g. 2025-05-01T17:00:00')
+    ap.add_argument('--drain-ms', type=int, default=3000, help='virtual ms to wait after the last event')
+    ap.add_argument('--generate', type=int, metavar='N', help='print a synthetic trace with N tool taps')
+    ap.add_argument('--echo', action='store_true', help="show the nodes' console output")
+    args = ap.parse_args(argv)
+
+    if args.generate:
+        sys.stdout.write(generate_trace(args.generate))
+        return 0
+    if not args.trace:
+        ap.error('a trace file is required')
+    report = replay(load_trace(args.trace), args.speed, args.start, args.drain_ms, args.echo)
+    print(json.dumps(report, indent=2))
+    return 0 if all(n.get('log', {}).get('ok', True) and not n['errors']
+                    for n in report['nodes'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import argparse, calendar, json, random, sys, threading, time   # power-save latency harness
+
+from .board import Board
+from .clock import Clock
+from .replay import percentile
+
+# what to inject per node and the console line that means "handled"
+EVENTS = {
+    'Tool_Scanner':     ('tap', 'A1745C3EB7', 'User Verified'),
+    'ID_Scanner_Servo': ('tap', '8E8939033D', 'User Verified'),
+    'IR_Buzzer_Host':   ('motion', 300, 'Motion at'),
+}
+
+
+def measure(node, power_save, count=10, idle_ms=500, seed=1, echo=False):
+    """
+    Boot one node with POWER_SAVE on or off, let it go idle before every
+    event, inject a tap (scanners) or PIR trigger (IR host) at a random
+    phase of its sleep cycle and time event -> handled in virtual ms.
+    IR_Buzzer_Host runs at 03:00 local so it is after hours and may sleep.
+    """
+    day = time.gmtime()
+    clock = Clock(start=calendar.timegm((day[0], day[1], day[2], 10, 0, 0)), speed=1.0)
+    config = {'POWER_SAVE': power_save, 'IDLE_AFTER_MS': idle_ms, 'WAKE_WINDOW_MS': 0, 'WAKE_EVERY_S': 3600}
+    board = Board(node, clock, echo=echo).start(config)
+    board.wait_port(80, timeout=10)
+    kind, arg, marker = EVENTS[node]
+
+    handled, at = threading.Event(), [0.0]
+
+    def listen(ms, k, args):
+        if k == 'print' and args[0].startswith(marker) and not handled.is_set():
+            at[0] = ms
+            handled.set()
+
+    board.listeners.append(listen)
+    rnd = random.Random(seed)
+    lat, missed = [], 0
+    for _ in range(count):
+        time.sleep((idle_ms + 200 + rnd.random() * 300) / 1000)  # asleep, somewhere in a slice
+        handled.clear()
+        t0 = clock.elapsed_ms()
+        if kind == 'tap':
+            board.rfid.present(arg)
+        else:
+            board.pir.trigger(arg)
+        if handled.wait(2.0):
+            lat.append(at[0] - t0)
+        else:
+            missed += 1
+        if kind == 'tap':
+            time.sleep(0.1)
+            board.rfid.remove()
+        else:
+            board.globals['alarm_active'] = False  # same as GET /stop
+            board.globals['buzz'].cancel_flag = True
+        time.sleep(1.2)                        # node finishes its LED blink / door wait
+
+    elapsed = clock.elapsed_ms()
+    stats = board.globals['power'].stats()
+    clock.stop()
+    board.stop()
+    return {'node': node, 'power_save': power_save, 'events': count, 'missed': missed,
+            'p50_ms': round(percentile(lat, 50), 1) if lat else None,
+            'p99_ms': round(percentile(lat, 99), 1) if lat else None,
+            'max_ms': round(max(lat), 1) if lat else None,
+            'asleep_share': round(board.slept_ms / elapsed, 3),
+            'sleep_to_ready': {'n': stats['ready_n'], 'avg_ms': stats['ready_avg_ms'],
+                              'max_ms': stats['ready_max_ms']},
+            '_lat': lat}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m sim.wakelat',
+                                 description='Event-to-handled latency with and without light sleep.')
+    ap.add_argument('nodes', nargs='*', help='node directories (default: all three)')
+    ap.add_argument('--count', type=int, default=10, help='events per node and mode')
+    ap.add_argument('--idle-ms', type=int, default=500, help='IDLE_AFTER_MS used for the run')
+    ap.add_argument('--target-ms', type=float, default=150, help='latency budget to check against')
+    ap.add_argument('--echo', action='store_true', help='show node console output')
+    ap.add_argument('--json', help='write all results to this file')
+    args = ap.parse_args(argv)
+    for node in args.nodes:
+        if node not in EVENTS:
+            ap.error('unknown node {!r}, choose from {}'.format(node, ', '.join(sorted(EVENTS))))
+
+    results, ok = [], True
+    for node in args.nodes or sorted(EVENTS):
+        for power_save in (False, True):
+            r = measure(node, power_save, args.count, args.idle_ms, echo=args.echo)
+            lat = r.pop('_lat')
+            r['within_target'] = sum(1 for x in lat if x <= args.target_ms)
+            if power_save:
+                ok &= r['within_target'] == r['events']
+            results.append(r)
+            print("{node:<17} power_save={power_save!s:<5} p50 {p50_ms} ms  p99 {p99_ms} ms  max {max_ms} ms  "
+                  "within {within_target}/{events}  asleep {asleep_share:.0%}  sleep->ready {sleep_to_ready}".format(**r))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
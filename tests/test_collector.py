@@ -0,0 +1,93 @@
+import json, os, socket, tempfile, threading, unittest   # collector ingest regressions
+
+from collector import Collector, Store
+from collector.server import valid_batch
+
+
+class CollectorIngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = Store(os.path.join(self.tmp.name, 'events.db'))
+        self.c = Collector(self.store, udp=('127.0.0.1', 0), http=('127.0.0.1', 0))
+
+    def tearDown(self):
+        if self.c.running.is_set():
+            self.c.stop()                      # http.shutdown() blocks unless serve_forever runs
+        self.c.udp.close()
+        self.c.http.server_close()
+        self.tmp.cleanup()
+
+    def _waiter(self, batch):
+        w = (threading.Event(), {})
+        self.c.inbox.put((batch, None, w))
+        return w
+
+    def test_valid_batch_shapes(self):
+        good = {'n': 'tool', 'b': 1, 's': 1, 'e': [[1700000000, 'x', 'tap']]}
+        self.assertTrue(valid_batch(good))
+        for bad in (None, [], dict(good, s='1'), dict(good, b=1.5), dict(good, e='x'),
+                    dict(good, e=[[]]), dict(good, e=[['1', 'x', 'tap']]), dict(good, s=True),
+                    dict(good, e=[[float('inf'), 'x', 'tap']]), dict(good, e=[[float('nan'), 'x', 'tap']]),
+                    dict(good, e=[[2 ** 63, 'x', 'tap']]), dict(good, e=[[10 ** 400, 'x', 'tap']]),
+                    dict(good, b=2 ** 64), dict(good, s=2 ** 63 - 1)):
+            self.assertFalse(valid_batch(bad), bad)
+
+    def test_bad_udp_batch_is_counted_and_good_one_acked(self):
+        self.c.start()
+        node = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        node.settimeout(2)
+        bad = {'n': 'tool', 'b': 7, 's': '1', 'e': [[1700000000, 'x', 'tap']]}
+        good = {'n': 'tool', 'b': 7, 's': 1, 'e': [[1700000000, 'x', 'tap'], [1700000001, 'y', 'tap']]}
+        node.sendto(json.dumps(bad).encode(), self.c.udp_addr)
+        node.sendto(json.dumps(good).encode(), self.c.udp_addr)
+        self.assertEqual(json.loads(node.recvfrom(256)[0]), {'b': 7, 'a': 2})
+        node.close()
+        self.assertEqual(self.c.stats['bad'], 1)
+        self.assertEqual(self.c.stats['events'], 2)
+
+    def test_infinite_or_huge_time_does_not_stop_acks(self):
+        self.c.start()
+        node = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        node.settimeout(2)
+        node.sendto(b'{"n":"tool","b":1,"s":1,"e":[[Infinity,"x","tap"]]}', self.c.udp_addr)
+        node.sendto(b'{"n":"tool","b":1,"s":2,"e":[[1%s,"x","tap"]]}' % (b'0' * 30), self.c.udp_addr)
+        good = {'n': 'tool', 'b': 1, 's': 3, 'e': [[1700000000, 'x', 'tap']]}
+        node.sendto(json.dumps(good).encode(), self.c.udp_addr)
+        self.assertEqual(json.loads(node.recvfrom(256)[0]), {'b': 1, 'a': 3})
+        node.close()
+        self.assertEqual(self.c.stats['bad'], 2)
+        self.assertEqual(self.c.stats['events'], 1)
+
+    def test_overflow_in_store_keeps_the_writer_alive(self):
+        # bypasses valid_batch(): the writer itself must survive OverflowError
+        poisoned = self._waiter({'n': 'id', 'b': 1, 's': 1, 'e': [[float('inf'), 'x', 'tap']]})
+        huge = self._waiter({'n': 'id', 'b': 2 ** 70, 's': 1, 'e': [[1700000000, 'x', 'tap']]})
+        ok = self._waiter({'n': 'ir', 'b': 2, 's': 5, 'e': [[1700000000, 'x', 'motion']]})
+        self.c.start()
+        for done, _ in (poisoned, huge, ok):
+            self.assertTrue(done.wait(2))
+        self.assertEqual(poisoned[1], {'error': 'bad batch'})
+        self.assertEqual(huge[1], {'error': 'bad batch'})
+        self.assertEqual(ok[1], {'b': 2, 'a': 5})
+        self.assertEqual(self.c.stats['bad'], 2)
+
+    def test_poisoned_batch_does_not_block_the_transaction(self):
+        # passes valid_batch() but sqlite cannot bind the dict in the ts column
+        poisoned = self._waiter({'n': 'id', 'b': 1, 's': 1, 'e': [[1700000000, {'x': 1}, 'tap']]})
+        ok = self._waiter({'n': 'ir', 'b': 2, 's': 5, 'e': [[1700000000, 'x', 'motion']]})
+        self.c.start()                         # both queued: drained into one transaction
+        for done, _ in (poisoned, ok):
+            self.assertTrue(done.wait(2))
+        self.assertEqual(poisoned[1], {'error': 'bad batch'})
+        self.assertEqual(ok[1], {'b': 2, 'a': 5})
+        self.assertEqual([r['node'] for r in self.store.query()], ['ir'])
+        self.assertEqual(self.c.stats['bad'], 1)
+
+        later = self._waiter({'n': 'ir', 'b': 2, 's': 6, 'e': [[1700000001, 'y', 'motion']]})
+        self.assertTrue(later[0].wait(2))      # writer thread is still alive
+        self.assertEqual(later[1], {'b': 2, 'a': 6})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import calendar, os, tempfile, unittest   # IR_Buzzer_Host business-hours calendar
+
+from sim.board import Board, REPO_ROOT
+from sim.clock import Clock
+
+RULES = [((0, 1, 2, 3, 4), '09:00', '17:00'), ((5,), '10:00', '14:00')]   # Mon-Fri, Sat
+
+
+def at(y, mo, d, h, mi=0, s=0):
+    return calendar.timegm((y, mo, d, h, mi, s))
+
+
+class ScheduleTest(unittest.TestCase):
+    """Runs schedule.py against the simulator's machine/_thread/time stand-ins, local time = UTC."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = Clock(start=at(2025, 5, 2, 12), speed=1.0)   # Friday noon
+        self.board = Board('IR_Buzzer_Host', self.clock, fs_root=self.tmp.name, echo=False)
+        self.mod = self.board.load('schedule', os.path.join(REPO_ROOT, 'IR_Buzzer_Host', 'schedule.py'))
+        self.changes = []
+
+    def tearDown(self):
+        self.clock.stop()                      # pending sim Timers see this and do nothing
+        self.tmp.cleanup()
+
+    def make(self, rules=RULES, holidays=()):
+        return self.mod.Schedule(rules, holidays, 0, lambda b, until: self.changes.append((b, until)))
+
+    def goto(self, t):
+        self.clock.start = t - (self.clock.now() - self.clock.start)  # virtual now() reads t
+
+    def test_weekday_hours(self):
+        s = self.make()
+        self.assertTrue(s.business and s.scheduled)
+        self.assertEqual(s.next_change, at(2025, 5, 2, 17))
+        self.assertEqual(self.changes, [(True, at(2025, 5, 2, 17))])
+
+    def test_saturday_rolls_to_tuesday_over_monday_holiday(self):
+        self.goto(at(2025, 5, 3, 15))          # Saturday after closing
+        s = self.make(holidays=['2025-05-05'])
+        self.assertFalse(s.business)
+        self.assertEqual(s.next_change, at(2025, 5, 6, 9))
+
+    def test_holiday_on_weekday(self):
+        self.goto(at(2025, 5, 5, 10))
+        s = self.make(holidays=['2025-05-05'])
+        self.assertFalse(s.business)
+        self.assertEqual(s.next_change, at(2025, 5, 6, 9))
+
+    def test_overnight_spans_merge(self):
+        self.goto(at(2025, 5, 2, 20))          # Friday evening
+        s = self.make([((4,), '17:00', '24:00'), ((5,), '00:00', '09:00')])
+        self.assertTrue(s.business)
+        self.assertEqual(s.next_change, at(2025, 5, 3, 9))  # no change at midnight
+
+    def test_override_past_a_scheduled_boundary(self):
+        self.goto(at(2025, 5, 2, 16))          # Friday 16:00
+        s = self.make()
+        s.hold(True, s.at('18:00'))
+        self.assertEqual((s.business, s.next_change), (True, at(2025, 5, 2, 18)))
+        self.assertEqual(s.recheck, at(2025, 5, 2, 17))     # `scheduled` changes first
+
+        self.goto(at(2025, 5, 2, 17, 0, 1))
+        s.update()                             # what the main loop does at recheck
+        self.assertFalse(s.scheduled)
+        self.assertTrue(s.business)
+        self.assertEqual(s.recheck, at(2025, 5, 2, 18))
+
+        self.goto(at(2025, 5, 2, 18, 0, 1))
+        s.update()
+        self.assertIsNone(s.override)          # timed override ran out
+        self.assertFalse(s.business)
+        self.assertEqual(s.next_change, at(2025, 5, 3, 10))
+        self.assertEqual(self.changes[-1], (False, at(2025, 5, 3, 10)))
+
+    def test_hold_defaults_to_next_scheduled_change(self):
+        s = self.make()
+        s.hold(False)
+        self.assertFalse(s.business)
+        self.assertEqual(s.next_change, at(2025, 5, 2, 17))
+        s.resume()
+        self.assertTrue(s.business)
+        self.assertIsNone(s.override)
+
+    def test_at_and_bad_clock_strings(self):
+        s = self.make()
+        self.assertEqual(s.at('18:00'), at(2025, 5, 2, 18))
+        self.assertEqual(s.at('08:00'), at(2025, 5, 3, 8))  # already past: tomorrow
+        self.assertEqual(s.at('24:00'), at(2025, 5, 3, 0))
+        for bad in ('18', 'ab:cd', '25:00', '24:30', '12:60', '1:2:3'):
+            self.assertRaises(ValueError, s.at, bad)
+
+    def test_timer_callback_is_lock_free(self):
+        s = self.make()
+        with s.lock:                           # e.g. the web thread inside hold()
+            s._fire(None)                      # must not block
+        self.assertTrue(s.due)
+        s.update()
+        self.assertFalse(s.due)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sqlite3, unittest   # unlock/tool correlation
+
+from collector.sessions import SCHEMA, Correlator, holders
+
+
+def unlock(id, t, uid='U1', name='User 1'):
+    return {'id': id, 'node': 'id', 't': t, 'kind': 'tap', 'uid': uid, 'name': name, 'state': ''}
+
+
+def close(id, t, uid='U1'):
+    return {'id': id, 'node': 'id', 't': t, 'kind': 'close', 'uid': uid, 'name': '', 'state': ''}
+
+
+def tool(id, t, uid='T1', name='Drill', state='Checked Out'):
+    return {'id': id, 'node': 'tool', 't': t, 'kind': 'tap', 'uid': uid, 'name': name, 'state': state}
+
+
+class CorrelatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.c = Correlator(bucket=300, grace=60, max_open=1800, horizon=6 * 3600)
+        self.tools = {}                        # tool event id -> latest attributed session id
+
+    def feed(self, *events):
+        for e in events:
+            self.c.feed(e)
+        for eid, ev in self.c.dirty_events.items():
+            self.tools[eid] = ev['session']
+        self.c.dirty_events.clear()
+        self.c.dirty_sessions.clear()
+
+    def test_tool_event_before_its_unlock(self):
+        self.feed(tool(100, 1100))             # tool node pushed first
+        self.assertIsNone(self.tools[100])
+        self.feed(unlock(1, 1000))
+        self.assertEqual(self.tools[100], 1)
+        self.assertEqual(self.c.stats['attributed'], 1)
+
+    def test_close_plus_grace(self):
+        self.feed(unlock(1, 1000), close(2, 1200), tool(100, 1250), tool(101, 1300))
+        self.assertEqual(self.tools[100], 1)
+        self.assertIsNone(self.tools[101])
+        self.assertEqual(self.c.sessions[1].end, 1260)
+
+    def test_late_close_shrinks_window(self):
+        self.feed(unlock(1, 1000), tool(100, 1300))
+        self.assertEqual(self.tools[100], 1)   # no close yet: max_open applies
+        self.feed(close(2, 1200))
+        self.assertIsNone(self.tools[100])
+        self.assertEqual(self.c.stats['attributed'], 0)
+
+    def test_next_unlock_truncates_open_session(self):
+        self.feed(unlock(1, 1000, 'U1'), tool(100, 1400), tool(101, 1700))
+        self.assertEqual((self.tools[100], self.tools[101]), (1, 1))
+        self.feed(unlock(2, 1500, 'U2', 'User 2'))
+        self.assertEqual((self.tools[100], self.tools[101]), (1, 2))
+        self.assertEqual(self.c.sessions[1].end, 1500)
+
+    def test_later_unlock_wins_inside_grace(self):
+        self.feed(unlock(1, 1000, 'U1'), close(2, 1100, 'U1'), unlock(3, 1130, 'U2', 'User 2'),
+                  tool(100, 1140))
+        self.assertEqual(self.tools[100], 3)   # later unlock wins inside the grace overlap
+
+    def test_unauthorized_tap_is_not_a_session(self):
+        self.feed(unlock(1, 1000, name='Unauthorized'), tool(100, 1100))
+        self.assertIsNone(self.tools[100])
+        self.assertEqual(self.c.stats['sessions'], 0)
+
+    def test_horizon_expiry(self):
+        self.feed(unlock(1, 1000), tool(100, 1100))
+        self.feed(tool(101, 1000 + 1800 + 6 * 3600 + 600))  # watermark moves past the horizon
+        self.assertNotIn(1, self.c.sessions)
+        self.assertEqual(self.c.order, [])
+        self.assertNotIn(1100 // 300, self.c.tools)
+        self.feed(tool(102, 1200))             # too late to re-attribute
+        self.assertIsNone(self.tools[102])
+
+    def test_flush_and_holders(self):
+        db = sqlite3.connect(':memory:')
+        db.executescript(SCHEMA)
+        self.c.feed(unlock(1, 1000))
+        self.c.feed(tool(100, 1100, 'T1', 'Drill', 'Checked Out'))
+        self.c.feed(tool(101, 1150, 'T2', 'Saw', 'Checked Out'))
+        self.c.feed(tool(102, 1160, 'T2', 'Saw', 'Checked In'))
+        self.c.flush(db)
+        self.assertEqual(holders(db), [{'tool_uid': 'T1', 'tool': 'Drill', 't': 1100,
+                                        'user': 'User 1', 'user_uid': 'U1'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import socket, time, _thread, os               # UDP, timing, background sender
+try:
+    import ujson as json                       # MicroPython
+except ImportError:
+    import json                                # CPython (simulator, tests)
+
+# ports whose epoch is 2000-01-01 (older ESP32 builds) report time.time()
+# 946684800 s behind Unix time; the collector stores UTC epoch seconds since 1970
+EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+class Uplink:
+    """
+    Batched, non-blocking event push from a node to the central collector.
+
+    push() only appends to an in-memory queue, so a tap is never delayed by
+    the network. A background thread sends up to BATCH events per UDP
+    datagram and drops them once the collector acknowledges the sequence
+    number; unacknowledged batches are retried with backoff. Sequence
+    numbers are per boot, so the collector can discard duplicates.
+
+    - host: collector address, or None to disable pushing entirely
+    - node: short node name stored with every event ('id', 'tool', 'ir')
+    """
+
+    BATCH       = 16                           # events per datagram (about one MTU)
+    MAX_QUEUE   = 500                          # oldest events dropped beyond this
+    ACK_TIMEOUT = 0.3                          # seconds to wait for an ack
+    MAX_BACKOFF = 5000                         # ms between retries at worst
+    IDLE_MS     = 200                          # sender sleep when nothing is queued
+
+    def __init__(self, host, port, node):
+        self.host = host
+        self.port = port
+        self.node = node
+        self.boot = int.from_bytes(os.urandom(4), 'big') & 0x7FFFFFFF  # tells reboots apart
+        self.seq = 0                           # last sequence number handed out
+        self.queue = []                        # [(seq, event), ...] not yet acknowledged
+        self.dropped = 0
+        self.acked = 0
+        self.lock = _thread.allocate_lock()
+
+    def push(self, ts, kind, uid='', name='', state=''):
+        if not self.host:
+            return
+        with self.lock:
+            self.seq += 1
+            self.queue.append((self.seq, [time.time() + EPOCH_OFFSET, ts, kind, uid, name, state]))
+            if len(self.queue) > self.MAX_QUEUE:
+                self.queue.pop(0)              # keep memory bounded while offline
+                self.dropped += 1
+
+    def start(self):
+        if self.host:
+            _thread.start_new_thread(self._run, ())
+
+    def _run(self):
+        addr = socket.getaddrinfo(self.host, self.port)[0][-1]
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(self.ACK_TIMEOUT)
+        backoff = 0
+        while True:
+            with self.lock:
+                batch = self.queue[:self.BATCH]
+            if not batch:
+                time.sleep_ms(self.IDLE_MS)
+                continue
+            msg = json.dumps({'n': self.node, 'b': self.boot, 's': batch[0][0],
+                              'e': [e for _, e in batch]})
+            try:
+                sock.sendto(msg, addr)
+                ack = self._wait_ack(sock)
+            except OSError:
+                ack = None                     # send failed or ack timed out
+            if ack is None:
+                backoff = min(self.MAX_BACKOFF, backoff * 2 or 250)
+                time.sleep_ms(backoff)
+                continue
+            backoff = 0
+            with self.lock:
+                while self.queue and self.queue[0][0] <= ack:
+                    self.queue.pop(0)          # collector has these, stop resending
+                    self.acked += 1
+
+    def _wait_ack(self, sock):
+        while True:
+            data, _ = sock.recvfrom(128)       # raises OSError on timeout
+            try:
+                ack = json.loads(data)
+            except ValueError:
+                continue
+            if ack.get('b') == self.boot:      # ignore acks meant for an earlier boot
+                return ack.get('a')